@@ -0,0 +1,49 @@
+import logging
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.core.admission import AdmissionRejected, controllers
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Seconds the client is willing to wait for an expensive route to start.
+BUDGET_HEADER = "X-Request-Timeout"
+
+
+def parse_budget(request: Request) -> Optional[float]:
+    """Read the client's wait budget from the request headers, if valid."""
+    try:
+        budget = float(request.headers[BUDGET_HEADER])
+    except (KeyError, ValueError):
+        return None
+    return budget if budget >= 0 else None
+
+
+def admit(name: str) -> Callable[[Request], AsyncGenerator[None, None]]:
+    """
+    Build a dependency that holds a slot of the named admission controller
+    for the duration of the request, answering 429/503 with Retry-After when
+    the request is shed.
+    """
+    controller = controllers[name]
+
+    async def dependency(request: Request) -> AsyncGenerator[None, None]:
+        try:
+            async with controller.slot(parse_budget(request)):
+                yield
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=f"Server busy: {e.reason}",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+    return dependency
+
+
+@router.get("/", response_model=Dict[str, Dict[str, Any]])
+async def admission_stats() -> Dict[str, Dict[str, Any]]:
+    """API endpoint reporting queue depth, in-flight and shed counts per limited route."""
+    return {name: controller.stats() for name, controller in controllers.items()}
@@ -0,0 +1,44 @@
+import logging
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import SessionLocal
+from app.services.analytics import get_cross_asset_matrices
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asynchronous database session."""
+    async with SessionLocal() as session:
+        yield session
+
+
+@router.get("/")
+async def cross_asset_analytics(
+    symbols: str = Query(..., description="Comma-separated asset symbols"),
+    benchmark: str = Query(..., description="Symbol the betas are computed against"),
+    window: int = Query(90, ge=2, le=5000, description="Number of most recent aligned returns"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    API endpoint returning correlation, covariance and beta matrices over stored
+    price history. Matrix rows and columns follow the order of `symbols`.
+    """
+    try:
+        requested = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+        logger.info(f"Computing cross-asset analytics for {len(requested)} symbols against {benchmark}.")
+        payload = await get_cross_asset_matrices(db, requested, benchmark, window)
+        return Response(content=payload, media_type="application/json")
+    except LookupError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing cross-asset analytics: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import os
+import tempfile
+from typing import AsyncGenerator, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.admission import admit
+from app.core.database import SessionLocal
+from app.services.bulk_import import import_file
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Request body bytes buffered before each write to the spool file.
+SPOOL_WRITE_SIZE: int = 1 << 20
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asynchronous database session."""
+    async with SessionLocal() as session:
+        yield session
+
+
+async def spool_body(request: Request, suffix: str) -> str:
+    """
+    Stream the request body to a temporary file and return its path.
+
+    The body is buffered up to SPOOL_WRITE_SIZE bytes at a time and written
+    in a worker thread, so disk writes do not block the event loop.
+    """
+    handle = await asyncio.to_thread(tempfile.NamedTemporaryFile, suffix=suffix, delete=False)
+    try:
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= SPOOL_WRITE_SIZE:
+                await asyncio.to_thread(handle.write, buffer)
+                buffer.clear()
+        await asyncio.to_thread(handle.write, buffer)
+        await asyncio.to_thread(handle.close)
+    except BaseException:
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(os.remove, handle.name)
+        raise
+    return handle.name
+
+
+@router.post("/{kind}", response_model=Dict[str, int], dependencies=[Depends(admit("import"))])
+async def import_data(
+    kind: str,
+    request: Request,
+    format: str = Query("csv", description="csv or parquet"),
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, int]:
+    """
+    API endpoint to bulk import bars or metrics from a CSV or Parquet request body.
+    """
+    if format not in ("csv", "parquet"):
+        raise HTTPException(status_code=400, detail="format must be csv or parquet")
+
+    path = await spool_body(request, f".{format}")
+    try:
+        logger.info(f"Bulk import of {kind} triggered.")
+        return await import_file(db, path, kind, format, resume=False)
+    except ValueError as e:
+        logger.warning(f"Rejected import: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error importing {kind}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    finally:
+        os.remove(path)
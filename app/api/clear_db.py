@@ -6,7 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import delete
 
 from app.core.database import SessionLocal
-from app.core.models import Asset, Metric
+from app.core.models import Asset, Metric, PriceBar
+from app.services.search import symbol_index
+from app.services.ticks import tick_ingestor
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,10 +29,13 @@ async def clear_table_data(db: AsyncSession, model: type) -> None:
 
 
 async def clear_all_data(db: AsyncSession) -> None:
-    """Clear data from Metric and Asset tables in proper order."""
+    """Clear data from Metric, PriceBar and Asset tables in proper order."""
     try:
-        await clear_table_data(db, Metric)  # Metrics first due to FK constraints
+        await clear_table_data(db, Metric)  # Metrics and bars first due to FK constraints
+        await clear_table_data(db, PriceBar)
         await clear_table_data(db, Asset)
+        tick_ingestor.reset()  # rolling tick state was seeded from the cleared history
+        symbol_index.clear()
         logger.info("All data cleared successfully.")
     except Exception as e:
         logger.error(f"Error clearing data: {e}")
@@ -40,7 +45,7 @@ async def clear_all_data(db: AsyncSession) -> None:
 @router.delete("/", response_model=Dict[str, str])
 async def clear_db(db: AsyncSession = Depends(get_db)) -> Dict[str, str]:
     """
-    API endpoint to clear all data from the Asset and Metric tables.
+    API endpoint to clear all data from the Asset, Metric and PriceBar tables.
     """
     try:
         await clear_all_data(db)
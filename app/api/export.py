@@ -0,0 +1,40 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.export import FORMATS, export_dataset
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "arrow": "arrows", "parquet": "parquet"}
+
+
+@router.get("/{dataset}")
+async def export_data(
+    dataset: str,
+    format: str = Query("csv", description="csv, ndjson, arrow or parquet"),
+    symbols: Optional[str] = Query(None, description="Comma-separated asset symbols"),
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound on the timestamp"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound on the timestamp"),
+) -> StreamingResponse:
+    """
+    API endpoint streaming assets, metrics or price history without building
+    the response in memory.
+    """
+    try:
+        requested = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()] if symbols else None
+        stream = export_dataset(dataset, format, requested, since, until)
+    except ValueError as e:
+        logger.warning(f"Rejected export request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"{dataset}.{EXTENSIONS[format]}"
+    return StreamingResponse(
+        stream,
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -4,6 +4,7 @@ from typing import AsyncGenerator, Dict
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.admission import admit
 from app.core.database import SessionLocal
 from app.services.ingestion import ingest_data
 logging.basicConfig(level=logging.INFO)
@@ -24,7 +25,7 @@ async def perform_ingestion(db: AsyncSession) -> None:
     logger.info("Market data ingestion completed successfully.")
 
 
-@router.post("/", response_model=Dict[str, str])
+@router.post("/", response_model=Dict[str, str], dependencies=[Depends(admit("ingest"))])
 async def ingest_market_data(
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, str]:
@@ -3,10 +3,9 @@ from typing import Any, AsyncGenerator, Dict
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from app.core.database import SessionLocal
-from app.core.models import Asset, Metric
+from app.core.queries import select_metrics_by_symbols
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -18,34 +17,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-async def fetch_asset_by_symbol(db: AsyncSession, symbol: str) -> Asset:
-    """Fetch an asset by its symbol."""
-    result = await db.execute(select(Asset).where(Asset.symbol == symbol))
-    asset = result.scalar_one_or_none()
-    if not asset:
+async def fetch_metrics_by_symbol(db: AsyncSession, symbol: str) -> Dict[str, float]:
+    """Fetch the metrics of an asset, raising 404 if the asset or its metrics are missing."""
+    found = await select_metrics_by_symbols(db, [symbol])
+    if symbol not in found:
         logger.warning(f"Asset {symbol} not found.")
         raise HTTPException(status_code=404, detail="Asset not found")
-    return asset
-
-
-async def fetch_metric_by_asset(db: AsyncSession, asset_id: int, symbol: str) -> Metric:
-    """Fetch metric details by asset ID."""
-    result = await db.execute(select(Metric).where(Metric.asset_id == asset_id))
-    metric = result.scalar_one_or_none()
-    if not metric:
+    if found[symbol] is None:
         logger.warning(f"Metrics for asset {symbol} not available.")
         raise HTTPException(status_code=404, detail="Metrics not available for this asset")
-    return metric
-
-
-def format_metrics_response(symbol: str, metric: Metric) -> Dict[str, Any]:
-    """Format the metric information for API response."""
-    return {
-        "symbol": symbol,
-        "latest_price": metric.latest_price,
-        "change_percent_24h": metric.change_percent_24h,
-        "average_price_7d": metric.average_price_7d,
-    }
+    return found[symbol]
 
 
 @router.get("/{symbol}", response_model=Dict[str, Any])
@@ -53,10 +34,9 @@ async def get_metrics(symbol: str, db: AsyncSession = Depends(get_db)) -> Dict[s
     """API endpoint to fetch metrics for a given asset symbol."""
     try:
         logger.info(f"Fetching metrics for asset: {symbol}")
-        asset = await fetch_asset_by_symbol(db, symbol)
-        metric = await fetch_metric_by_asset(db, asset.id, symbol)
+        metric = await fetch_metrics_by_symbol(db, symbol)
         logger.info(f"Metrics for asset {symbol} retrieved successfully.")
-        return format_metrics_response(symbol, metric)
+        return {"symbol": symbol, **metric}
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,97 @@
+import logging
+from typing import Any, AsyncGenerator, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.database import SessionLocal
+from app.core.models import Asset, Metric
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Metric fields the screener can sort on; each is backed by an index.
+SORT_FIELDS = {
+    "latest_price": Metric.latest_price,
+    "change_percent_24h": Metric.change_percent_24h,
+    "average_price_7d": Metric.average_price_7d,
+}
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asynchronous database session."""
+    async with SessionLocal() as session:
+        yield session
+
+
+def build_screener_query(
+    sort_by: str,
+    order: str,
+    limit: int,
+    min_change: Optional[float],
+    max_change: Optional[float],
+    min_price: Optional[float],
+    max_price: Optional[float],
+):
+    """Build the filtered, ordered and limited screener query."""
+    column = SORT_FIELDS[sort_by]
+    query = (
+        select(
+            Asset.symbol,
+            Asset.name,
+            Metric.latest_price,
+            Metric.change_percent_24h,
+            Metric.average_price_7d,
+        )
+        .select_from(Metric)
+        .join(Asset, Asset.id == Metric.asset_id)
+    )
+
+    if min_change is not None:
+        query = query.where(Metric.change_percent_24h >= min_change)
+    if max_change is not None:
+        query = query.where(Metric.change_percent_24h <= max_change)
+    if min_price is not None:
+        query = query.where(Metric.latest_price >= min_price)
+    if max_price is not None:
+        query = query.where(Metric.latest_price <= max_price)
+
+    return query.order_by(column.desc() if order == "desc" else column.asc()).limit(limit)
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+async def screen_assets(
+    sort_by: str = Query("change_percent_24h", description="Metric field to sort on"),
+    order: Literal["asc", "desc"] = Query("desc", description="desc for top movers, asc for bottom"),
+    limit: int = Query(10, ge=1, le=1000, description="Number of assets to return"),
+    min_change: Optional[float] = Query(None, description="Minimum change_percent_24h"),
+    max_change: Optional[float] = Query(None, description="Maximum change_percent_24h"),
+    min_price: Optional[float] = Query(None, description="Minimum latest_price"),
+    max_price: Optional[float] = Query(None, description="Maximum latest_price"),
+    db: AsyncSession = Depends(get_db),
+) -> List[Dict[str, Any]]:
+    """API endpoint returning the top or bottom N assets by a metric, with optional filters."""
+    if sort_by not in SORT_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort_by must be one of: {', '.join(SORT_FIELDS)}",
+        )
+
+    try:
+        logger.info(f"Screening assets by {sort_by} {order}, limit {limit}.")
+        query = build_screener_query(sort_by, order, limit, min_change, max_change, min_price, max_price)
+        result = await db.execute(query)
+        return [
+            {
+                "symbol": symbol,
+                "name": name,
+                "latest_price": latest_price,
+                "change_percent_24h": change_percent_24h,
+                "average_price_7d": average_price_7d,
+            }
+            for symbol, name, latest_price, change_percent_24h, average_price_7d in result.all()
+        ]
+    except Exception as e:
+        logger.error(f"Error screening assets: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
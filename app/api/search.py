@@ -0,0 +1,23 @@
+import logging
+from typing import Dict, List
+
+from fastapi import APIRouter, Query
+
+from app.services.search import DEFAULT_LIMIT, symbol_index
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Dict[str, str]])
+async def search_assets(
+    q: str = Query(..., min_length=1, description="Symbol or name, or the start of one"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=50),
+) -> List[Dict[str, str]]:
+    """
+    API endpoint for symbol autocomplete.
+
+    Served from the in-memory index: exact symbol, symbol prefix, name prefix,
+    then typo-tolerant matches.
+    """
+    return symbol_index.search(q, limit)
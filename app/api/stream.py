@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.services.broadcast import Subscriber, broadcaster
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def parse_symbols(value: Optional[str]) -> List[str]:
+    """Split a comma-separated symbol list, ignoring blanks."""
+    return [symbol.strip() for symbol in (value or "").split(",") if symbol.strip()]
+
+
+async def receive_subscriptions(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """
+    Apply subscription changes sent by the client.
+
+    Messages look like {"subscribe": ["BTC-USD"]} or {"unsubscribe": ["TSLA"]}.
+    """
+    while True:
+        message = await websocket.receive_json()
+        if not isinstance(message, dict):
+            continue
+        for action, apply in (("subscribe", broadcaster.subscribe), ("unsubscribe", broadcaster.unsubscribe)):
+            symbols = message.get(action)
+            if isinstance(symbols, list):
+                apply(subscriber, [str(symbol) for symbol in symbols])
+
+
+async def send_updates(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Push coalesced metric deltas as {symbol: {field: value}} messages."""
+    while True:
+        batch = await subscriber.next_batch()
+        if batch:
+            await websocket.send_json(batch)
+
+
+@router.websocket("/metrics")
+async def stream_metrics(websocket: WebSocket, symbols: Optional[str] = None) -> None:
+    """
+    WebSocket endpoint pushing metric changes for subscribed symbols.
+
+    Initial symbols can be given as a comma-separated `symbols` query
+    parameter; the latest known values are sent first, then only the fields
+    that change after each ingestion commit.
+    """
+    await websocket.accept()
+    subscriber = Subscriber()
+    broadcaster.subscribe(subscriber, parse_symbols(symbols))
+    logger.info(f"Metric stream opened for {len(subscriber.symbols)} symbols.")
+
+    tasks = [
+        asyncio.create_task(receive_subscriptions(websocket, subscriber)),
+        asyncio.create_task(send_updates(websocket, subscriber)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                logger.error(f"Metric stream closed with error: {error}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        broadcaster.unsubscribe(subscriber)
+        logger.info("Metric stream closed.")
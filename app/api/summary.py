@@ -2,9 +2,11 @@ import logging
 from typing import Any, AsyncGenerator, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.api.admission import admit
 from app.core.database import SessionLocal
 from app.core.models import Asset, Metric
 from app.services.genai import generate_summary
@@ -48,7 +50,7 @@ async def fetch_asset_metrics(db: AsyncSession) -> List[Dict[str, Any]]:
     ]
 
 
-@router.get("/", response_model=Dict[str, str])
+@router.get("/", response_model=Dict[str, str], dependencies=[Depends(admit("summary"))])
 async def get_summary(db: AsyncSession = Depends(get_db)) -> Dict[str, str]:
     """
     API endpoint to generate a summary of asset metrics.
@@ -60,7 +62,8 @@ async def get_summary(db: AsyncSession = Depends(get_db)) -> Dict[str, str]:
         if not data:
             return {"summary": "No data available to summarize."}
 
-        summary = generate_summary(data)
+        # Inference is CPU-bound; keep it off the event loop so reads are not stalled.
+        summary = await run_in_threadpool(generate_summary, data)
         logger.info("Summary generated successfully.")
         return {"summary": summary}
 
@@ -0,0 +1,48 @@
+import logging
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Dict, List, Optional
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import SessionLocal
+from app.services.ticks import tick_ingestor
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+class TickIn(BaseModel):
+    """A trade, quote or bar close; the timestamp defaults to the time of receipt."""
+
+    symbol: str = Field(min_length=1)
+    price: float = Field(gt=0)
+    timestamp: Optional[datetime] = None
+    volume: Optional[float] = Field(default=None, ge=0)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asynchronous database session."""
+    async with SessionLocal() as session:
+        yield session
+
+
+@router.post("/", response_model=Dict[str, int])
+async def push_ticks(ticks: List[TickIn], db: AsyncSession = Depends(get_db)) -> Dict[str, int]:
+    """
+    API endpoint to push a batch of ticks.
+
+    Metrics are updated in memory immediately and written to the database
+    and the metric stream by the next periodic flush.
+    """
+    now = datetime.now(timezone.utc)
+    return await tick_ingestor.ingest(
+        db, [(tick.symbol, tick.price, tick.timestamp or now, tick.volume) for tick in ticks]
+    )
+
+
+@router.get("/stats", response_model=Dict[str, int])
+async def tick_stats() -> Dict[str, int]:
+    """API endpoint reporting tracked symbols, pending writes and tick counters."""
+    return tick_ingestor.stats()
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from app.core.database import SessionLocal, init_db
+from app.services.bulk_import import IMPORT_CHUNK_SIZE, KINDS, import_file
+from app.services.export import DATASETS, FORMATS, export_dataset
+from app.services.model_server import MAX_QUEUE, serve_model
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run_export(args: argparse.Namespace) -> None:
+    """Stream an export to a file, or to stdout when no output is given."""
+    await init_db()
+    symbols = args.symbols.split(",") if args.symbols else None
+    stream = export_dataset(args.dataset, args.format, symbols, args.since, args.until)
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for data in stream:
+            output.write(data)
+    finally:
+        if args.output:
+            output.close()
+
+
+async def run_import(args: argparse.Namespace) -> None:
+    """Import a CSV or Parquet file, resuming from its checkpoint if present."""
+    await init_db()
+    async with SessionLocal() as session:
+        totals = await import_file(
+            session, args.path, args.kind, args.format, args.chunk_size, resume=not args.restart
+        )
+    print(totals)
+
+
+async def run_model_server(args: argparse.Namespace) -> None:
+    """Serve the summarization model to API workers over a Unix socket."""
+    await serve_model(args.socket, args.max_queue)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Financial data tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Stream a dataset to a file or stdout.")
+    export.add_argument("dataset", choices=list(DATASETS))
+    export.add_argument("--format", choices=list(FORMATS), default="csv")
+    export.add_argument("--symbols", help="Comma-separated asset symbols.")
+    export.add_argument("--since", type=datetime.fromisoformat, help="Inclusive ISO-8601 lower bound.")
+    export.add_argument("--until", type=datetime.fromisoformat, help="Exclusive ISO-8601 upper bound.")
+    export.add_argument("--output", "-o", help="Output file; defaults to stdout.")
+    export.set_defaults(handler=run_export)
+
+    bulk_import = commands.add_parser("import", help="Bulk import bars or metrics from a file.")
+    bulk_import.add_argument("kind", choices=list(KINDS))
+    bulk_import.add_argument("path")
+    bulk_import.add_argument("--format", choices=["csv", "parquet"], help="Defaults to the file extension.")
+    bulk_import.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    bulk_import.add_argument("--restart", action="store_true", help="Ignore any saved progress.")
+    bulk_import.set_defaults(handler=run_import)
+
+    model_server = commands.add_parser("serve-model", help="Run the shared summarization model server.")
+    model_server.add_argument("--socket", default="/tmp/financial-genai.sock", help="Unix socket path.")
+    model_server.add_argument("--max-queue", type=int, default=MAX_QUEUE, help="Requests queued before refusing.")
+    model_server.set_defaults(handler=run_model_server)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Weight of the latest request in the moving average of service time.
+SERVICE_TIME_ALPHA: float = 0.2
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed instead of admitted.
+
+    Attributes:
+        status_code: 429 when the wait queue is full, 503 when the expected
+            wait exceeds the client's budget.
+        retry_after: Suggested number of seconds before retrying.
+    """
+
+    def __init__(self, status_code: int, retry_after: float, reason: str) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded, deadline-aware wait queue for one route.
+
+    At most `max_concurrency` requests run at once and at most `max_queue`
+    wait. A request is refused up front when the queue is full or when its
+    estimated wait exceeds its time budget. The estimate comes from a moving
+    average of service time. Cheap routes stay unlimited, so they are never
+    queued behind expensive ones.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        default_budget: float,
+        expected_service_time: float,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_budget = default_budget
+        self.service_time = expected_service_time
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted_total = 0
+        self.shed_total = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def estimated_wait(self) -> float:
+        """Expected seconds a newly arriving request would wait for a slot."""
+        ahead = self.in_flight + self.queued
+        if ahead < self.max_concurrency:
+            return 0.0
+        return (ahead - self.max_concurrency + 1) * self.service_time / self.max_concurrency
+
+    def _shed(self, status_code: int, retry_after: float, reason: str) -> AdmissionRejected:
+        self.shed_total += 1
+        logger.warning(f"Shedding {self.name} request: {reason}")
+        return AdmissionRejected(status_code, retry_after, reason)
+
+    @asynccontextmanager
+    async def slot(self, budget: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the duration of the block.
+
+        Args:
+            budget: Seconds the client is willing to wait for a slot;
+                defaults to the controller's default budget.
+
+        Raises:
+            AdmissionRejected: If the request is shed.
+        """
+        budget = self.default_budget if budget is None else budget
+        wait = self.estimated_wait()
+        if self.queued >= self.max_queue:
+            raise self._shed(429, wait, "wait queue is full")
+        if wait > budget:
+            raise self._shed(503, wait, f"expected wait {wait:.1f}s exceeds budget {budget:.1f}s")
+
+        self.queued += 1
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=budget)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            raise self._shed(503, self.estimated_wait(), "deadline expired while queued")
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        self.admitted_total += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Gauges and counters for monitoring."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "shed_total": self.shed_total,
+            "avg_service_seconds": round(self.service_time, 3),
+        }
+
+
+# Limits for the expensive routes; cheap reads are not limited.
+controllers: Dict[str, AdmissionController] = {
+    "summary": AdmissionController("summary", max_concurrency=2, max_queue=8, default_budget=30.0, expected_service_time=5.0),
+    "ingest": AdmissionController("ingest", max_concurrency=1, max_queue=4, default_budget=60.0, expected_service_time=10.0),
+    "import": AdmissionController("import", max_concurrency=1, max_queue=2, default_budget=60.0, expected_service_time=60.0),
+}
@@ -1,6 +1,8 @@
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +19,21 @@ SessionLocal: sessionmaker = sessionmaker(bind=engine, class_=AsyncSession, expi
 # Declarative base for models
 Base = declarative_base()
 
+# Columns added to existing tables after their first release, with their DDL;
+# create_all only creates missing tables, so these are added on startup.
+ADDED_COLUMNS: Dict[str, Dict[str, str]] = {
+    "price_bars": {"revision": "INTEGER NOT NULL DEFAULT 0"},
+}
+
+# Indexes added to existing tables after their first release, by name; the
+# names match the ones create_all gives the indexed model columns.
+ADDED_INDEXES: Dict[str, str] = {
+    "ix_metrics_asset_id": "metrics (asset_id)",
+    "ix_metrics_latest_price": "metrics (latest_price)",
+    "ix_metrics_change_percent_24h": "metrics (change_percent_24h)",
+    "ix_metrics_average_price_7d": "metrics (average_price_7d)",
+}
+
 
 def get_engine() -> AsyncEngine:
     """
@@ -47,6 +64,29 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def add_missing_columns(connection: Connection) -> None:
+    """
+    Add columns from ADDED_COLUMNS that an existing database does not have yet.
+    """
+    inspector = inspect(connection)
+    for table, columns in ADDED_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        for name, ddl in columns.items():
+            if name not in existing:
+                logger.info(f"Adding column {table}.{name}.")
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def add_missing_indexes(connection: Connection) -> None:
+    """
+    Create the indexes from ADDED_INDEXES that an existing database does not have yet.
+    """
+    for name, columns in ADDED_INDEXES.items():
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}"))
+
+
 async def init_db() -> None:
     """
     Initialize the database and create tables.
@@ -56,6 +96,8 @@ async def init_db() -> None:
 
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(add_missing_columns)
+            await conn.run_sync(add_missing_indexes)
 
         logger.info("Database initialized successfully.")
     except Exception as e:
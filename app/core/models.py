@@ -2,7 +2,7 @@ import logging
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.core.database import Base
 logging.basicConfig(level=logging.INFO)
@@ -20,17 +20,40 @@ class Asset(Base):
 
     # Relationship to metrics
     metrics: Mapped[List["Metric"]] = relationship("Metric", back_populates="asset")
+    price_bars: Mapped[List["PriceBar"]] = relationship("PriceBar", back_populates="asset")
 
 
 class Metric(Base):
     __tablename__ = "metrics"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    asset_id: Mapped[int] = mapped_column(ForeignKey("assets.id"), nullable=False)
-    latest_price: Mapped[float] = mapped_column(Float, nullable=False)
-    change_percent_24h: Mapped[float] = mapped_column(Float, nullable=False)
-    average_price_7d: Mapped[float] = mapped_column(Float, nullable=False)
+    asset_id: Mapped[int] = mapped_column(ForeignKey("assets.id"), nullable=False, index=True)
+    # Indexed so screener ORDER BY ... LIMIT N queries read N index entries;
+    # existing databases get the indexes from ADDED_INDEXES in app.core.database.
+    latest_price: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    change_percent_24h: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    average_price_7d: Mapped[float] = mapped_column(Float, nullable=False, index=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     # Relationship to asset
     asset: Mapped["Asset"] = relationship("Asset", back_populates="metrics")
+
+
+class PriceBar(Base):
+    __tablename__ = "price_bars"
+    # One bar per asset and timestamp; the constraint also indexes history lookups.
+    __table_args__ = (UniqueConstraint("asset_id", "timestamp", name="uq_price_bars_asset_timestamp"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    asset_id: Mapped[int] = mapped_column(ForeignKey("assets.id"), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    open: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    high: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    low: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    volume: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Bumped whenever an upsert changes the bar, so caches can detect amended history.
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # Relationship to asset
+    asset: Mapped["Asset"] = relationship("Asset", back_populates="price_bars")
@@ -0,0 +1,80 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import Asset, Metric
+logging.basicConfig(level=logging.INFO)
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Read-only queries for the hot endpoints. They select only the needed
+# columns from the Core tables and map rows straight into response dicts,
+# skipping ORM entity construction, the identity map and relationship loading.
+assets = Asset.__table__
+metrics = Metric.__table__
+
+METRIC_COLUMNS = (metrics.c.latest_price, metrics.c.change_percent_24h, metrics.c.average_price_7d)
+
+
+def metric_dict(latest_price: float, change_percent_24h: float, average_price_7d: float) -> Dict[str, float]:
+    """
+    Build the metric part of a response.
+    """
+    return {
+        "latest_price": latest_price,
+        "change_percent_24h": change_percent_24h,
+        "average_price_7d": average_price_7d,
+    }
+
+
+async def select_assets_with_metrics(db: AsyncSession) -> List[Dict[str, Any]]:
+    """
+    Return every asset with its list of metrics, or None when it has none.
+    """
+    query = (
+        select(assets.c.symbol, assets.c.name, *METRIC_COLUMNS)
+        .select_from(assets.outerjoin(metrics, metrics.c.asset_id == assets.c.id))
+        .order_by(assets.c.id, metrics.c.id)
+    )
+    result = await db.execute(query)
+
+    rows: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for symbol, name, latest_price, change_percent_24h, average_price_7d in result.all():
+        if current is None or current["symbol"] != symbol:
+            current = {"symbol": symbol, "name": name, "metrics": None}
+            rows.append(current)
+        # latest_price is NOT NULL, so None means the outer join found no metric
+        if latest_price is not None:
+            if current["metrics"] is None:
+                current["metrics"] = []
+            current["metrics"].append(metric_dict(latest_price, change_percent_24h, average_price_7d))
+    return rows
+
+
+async def select_metrics_by_symbols(
+    db: AsyncSession, symbols: Sequence[str]
+) -> Dict[str, Optional[Dict[str, float]]]:
+    """
+    Return the metrics of the given symbols in a single query.
+
+    Known assets without metrics map to None; unknown symbols are absent.
+    """
+    query = (
+        select(assets.c.symbol, *METRIC_COLUMNS)
+        .select_from(assets.outerjoin(metrics, metrics.c.asset_id == assets.c.id))
+        .where(assets.c.symbol.in_(list(symbols)))
+        .order_by(metrics.c.id)
+    )
+    result = await db.execute(query)
+
+    found: Dict[str, Optional[Dict[str, float]]] = {}
+    for symbol, latest_price, change_percent_24h, average_price_7d in result.all():
+        found[symbol] = (
+            metric_dict(latest_price, change_percent_24h, average_price_7d)
+            if latest_price is not None
+            else None
+        )
+    return found
@@ -1,8 +1,11 @@
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.routing import APIRouter
-from app.api import assets, metrics, compare, summary, ingest, clear_db
-from app.core.database import init_db
+from app.api import assets, metrics, compare, summary, ingest, clear_db, stream, analytics, screener, export, bulk_import, admission, ticks, search
+from app.core.database import SessionLocal, init_db
+from app.services.search import load_symbol_index, refresh_symbol_index_periodically
+from app.services.ticks import tick_ingestor
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,19 @@ def register_event_handlers(app: FastAPI) -> None:
         except Exception as e:
             logger.error(f"Error during database initialization: {e}")
             raise RuntimeError("Failed to initialize database.")
+        async with SessionLocal() as session:
+            await load_symbol_index(session)
+        # Picks up assets created by other workers; each worker has its own index.
+        app.state.search_refresh = asyncio.create_task(refresh_symbol_index_periodically())
+        tick_ingestor.start()
+
+    @app.on_event("shutdown")
+    async def shutdown_event() -> None:
+        app.state.search_refresh.cancel()
+        try:
+            await tick_ingestor.stop()
+        except Exception as e:
+            logger.error(f"Error flushing pending ticks during shutdown: {e}")
 
 
 def register_routers(app: FastAPI) -> None:
@@ -52,6 +68,14 @@ def register_routers(app: FastAPI) -> None:
         (compare.router, "/compare", ["Compare"]),
         (summary.router, "/summary", ["Summary"]),
         (clear_db.router, "/clear_db", ["Database"]),
+        (stream.router, "/stream", ["Stream"]),
+        (analytics.router, "/analytics", ["Analytics"]),
+        (screener.router, "/screener", ["Screener"]),
+        (export.router, "/export", ["Export"]),
+        (bulk_import.router, "/import", ["Import"]),
+        (admission.router, "/admission", ["Admission"]),
+        (ticks.router, "/ticks", ["Ticks"]),
+        (search.router, "/search", ["Search"]),
     ]
 
     for router, prefix, tags in routers:
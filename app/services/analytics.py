@@ -0,0 +1,379 @@
+import asyncio
+import json
+import logging
+import math
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.models import Asset, PriceBar
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of (symbol set, window) entries kept in the matrix cache.
+CACHE_SIZE: int = 32
+# Serialized results kept per entry, one per (symbol order, benchmark).
+PAYLOADS_PER_ENTRY: int = 4
+# Significant digits of serialized values; full float precision doubles the payload.
+SIGNIFICANT_DIGITS: int = 6
+NUMBER_FORMAT: str = f"%.{SIGNIFICANT_DIGITS}g"
+NON_FINITE = re.compile(r"-?(?:nan|inf)")
+
+# (latest bar timestamp, bar count, sum of bar revisions) over the requested assets.
+DataVersion = Tuple[Optional[datetime], int, int]
+# (sorted symbols, window)
+CacheKey = Tuple[Tuple[str, ...], int]
+
+
+class ReturnWindow:
+    """
+    Rolling window of aligned returns with running sums.
+
+    Keeps the column sums and the cross-product matrix X'X of the returns in
+    the window, so appending a bar costs O(k^2) for k symbols instead of a
+    full O(window * k^2) recomputation.
+    """
+
+    def __init__(self, returns: np.ndarray, window: int) -> None:
+        self.window = window
+        self.size = len(returns)
+        self.buffer = np.zeros((window, returns.shape[1]))
+        self.buffer[: self.size] = returns
+        self.head = self.size % window
+        self.updates = 0
+        self._resum()
+
+    def _resum(self) -> None:
+        rows = self.buffer[: self.size] if self.size < self.window else self.buffer
+        self.sums = rows.sum(axis=0)
+        self.cross = rows.T @ rows
+
+    def push(self, row: np.ndarray) -> None:
+        """Append one row of returns, evicting the oldest when the window is full."""
+        if self.size == self.window:
+            oldest = self.buffer[self.head]
+            self.sums -= oldest
+            self.cross -= np.outer(oldest, oldest)
+        else:
+            self.size += 1
+
+        self.buffer[self.head] = row
+        self.head = (self.head + 1) % self.window
+        self.sums += row
+        self.cross += np.outer(row, row)
+
+        # Re-derive the sums from the buffer now and then to stop rounding drift.
+        self.updates += 1
+        if self.updates >= self.window:
+            self.updates = 0
+            self._resum()
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance matrix of the returns in the window."""
+        n = self.size
+        return (self.cross - np.outer(self.sums, self.sums) / n) / (n - 1)
+
+
+class CacheEntry:
+    """
+    Cached return window for one (symbol set, window), with columns in sorted
+    symbol order, and its serialized results.
+    """
+
+    def __init__(
+        self,
+        returns: ReturnWindow,
+        last_prices: np.ndarray,
+        last_timestamp: datetime,
+        version: DataVersion,
+    ) -> None:
+        self.returns = returns
+        self.last_prices = last_prices
+        self.last_timestamp = last_timestamp
+        self.version = version
+        self.payload: Dict[Tuple[Tuple[str, ...], str], bytes] = {}
+
+
+_cache: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+_locks: Dict[CacheKey, asyncio.Lock] = {}
+
+
+def compute_matrices(covariance: np.ndarray, benchmark_index: int) -> Dict[str, np.ndarray]:
+    """
+    Derive correlation and beta from a covariance matrix in one vectorized pass.
+
+    Args:
+        covariance: k x k covariance matrix of returns.
+        benchmark_index: Column of the benchmark symbol.
+
+    Returns:
+        A dict with "covariance", "correlation" (k x k) and "beta" (k,).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(np.diag(covariance))
+        correlation = covariance / np.outer(std, std)
+        beta = covariance[:, benchmark_index] / covariance[benchmark_index, benchmark_index]
+    return {"covariance": covariance, "correlation": correlation, "beta": beta}
+
+
+def encode_array(values: np.ndarray) -> str:
+    """
+    Encode a 1-d or 2-d array as a JSON array of SIGNIFICANT_DIGITS-digit
+    numbers, mapping NaN/inf to null.
+
+    Formats all values with one %-operation instead of building nested lists
+    for json.dumps, which dominated the time of large responses.
+    """
+    row = "[" + ",".join([NUMBER_FORMAT] * values.shape[-1]) + "]"
+    template = "[" + ",".join([row] * values.shape[0]) + "]" if values.ndim == 2 else row
+    text = template % tuple(values.ravel().tolist())
+    return text if np.isfinite(values).all() else NON_FINITE.sub("null", text)
+
+
+def encode_number(value: float) -> str:
+    return NUMBER_FORMAT % value if math.isfinite(value) else "null"
+
+
+async def resolve_asset_ids(session: AsyncSession, symbols: List[str]) -> Dict[str, int]:
+    """
+    Map symbols to asset IDs.
+
+    Raises:
+        LookupError: If any symbol is unknown.
+    """
+    result = await session.execute(select(Asset.symbol, Asset.id).where(Asset.symbol.in_(symbols)))
+    ids = dict(result.all())
+    missing = [symbol for symbol in symbols if symbol not in ids]
+    if missing:
+        raise LookupError(f"Unknown symbols: {', '.join(missing)}")
+    return ids
+
+
+async def fetch_data_version(session: AsyncSession, asset_ids: List[int]) -> DataVersion:
+    """
+    Return the latest bar timestamp, bar count and revision total over the
+    given assets. Appending a bar changes the first two, amending one in place
+    changes the revision total.
+    """
+    result = await session.execute(
+        select(
+            func.max(PriceBar.timestamp), func.count(PriceBar.id), func.coalesce(func.sum(PriceBar.revision), 0)
+        ).where(PriceBar.asset_id.in_(asset_ids))
+    )
+    latest, count, revisions = result.one()
+    return latest, count, revisions
+
+
+async def fetch_cutoff(session: AsyncSession, asset_id: int, bars: int) -> Optional[datetime]:
+    """
+    Timestamp of an asset's `bars`-th most recent bar, or None if it has fewer.
+
+    Served by the (asset_id, timestamp) unique index without scanning history.
+    """
+    result = await session.execute(
+        select(PriceBar.timestamp)
+        .where(PriceBar.asset_id == asset_id)
+        .order_by(PriceBar.timestamp.desc())
+        .offset(bars - 1)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def fetch_closes(
+    session: AsyncSession,
+    asset_ids: List[int],
+    since: Optional[datetime] = None,
+    after: Optional[datetime] = None,
+) -> List[Tuple[int, datetime, float]]:
+    """
+    Load (asset_id, timestamp, close) rows of the given assets.
+
+    Args:
+        session: Active database session.
+        asset_ids: Assets to load.
+        since: Only load bars at or after this timestamp.
+        after: Only load bars strictly newer than this timestamp.
+    """
+    query = select(PriceBar.asset_id, PriceBar.timestamp, PriceBar.close).where(PriceBar.asset_id.in_(asset_ids))
+    if since is not None:
+        query = query.where(PriceBar.timestamp >= since)
+    if after is not None:
+        query = query.where(PriceBar.timestamp > after)
+
+    result = await session.execute(query)
+    return result.all()
+
+
+def align_prices(rows: List[Tuple[int, datetime, float]], asset_ids: List[int]) -> pd.DataFrame:
+    """
+    Pivot close rows into a timestamp x asset frame with columns in `asset_ids`
+    order, keeping only timestamps where every asset has a bar.
+    """
+    frame = pd.DataFrame(rows, columns=["asset_id", "timestamp", "close"])
+    prices = frame.pivot(index="timestamp", columns="asset_id", values="close")
+    return prices.reindex(columns=asset_ids).sort_index().dropna()
+
+
+def simple_returns(prices: np.ndarray) -> np.ndarray:
+    """Period-over-period simple returns of a price matrix (rows are time)."""
+    return prices[1:] / prices[:-1] - 1.0
+
+
+async def build_entry(
+    session: AsyncSession,
+    ids: Dict[str, int],
+    symbols: List[str],
+    benchmark: str,
+    window: int,
+    version: DataVersion,
+) -> CacheEntry:
+    """
+    Load the latest `window + 1` aligned prices and build a fresh cache entry.
+
+    The pivot and the O(window * k^2) sums run in a worker thread, so a cold
+    request for a large universe does not stall the event loop.
+    """
+    # Aligned timestamps are a subset of the benchmark's; the extra bars leave
+    # room for ones dropped because another symbol has no bar there.
+    since = await fetch_cutoff(session, ids[benchmark], 2 * window + 2)
+    rows = await fetch_closes(session, [ids[symbol] for symbol in symbols], since=since)
+    return await asyncio.to_thread(entry_from_closes, rows, [ids[symbol] for symbol in symbols], window, version)
+
+
+def entry_from_closes(
+    rows: List[Tuple[int, datetime, float]], asset_ids: List[int], window: int, version: DataVersion
+) -> CacheEntry:
+    prices = align_prices(rows, asset_ids).tail(window + 1)
+    if len(prices) < 3:
+        raise ValueError("Not enough overlapping price history for the requested symbols.")
+
+    values = prices.to_numpy(dtype=float)
+    returns = ReturnWindow(simple_returns(values), window)
+    return CacheEntry(returns, values[-1], prices.index[-1].to_pydatetime(), version)
+
+
+async def update_entry(
+    session: AsyncSession, entry: CacheEntry, ids: Dict[str, int], symbols: List[str], version: DataVersion
+) -> bool:
+    """
+    Append bars newer than the cached ones to an entry.
+
+    Returns:
+        False if the change is not a pure append (e.g. a backfill or an
+        amended bar) and the entry has to be rebuilt.
+    """
+    new_bars = version[1] - entry.version[1]
+    if version[0] is None or entry.version[0] is None or version[0] <= entry.version[0] or new_bars <= 0:
+        return False
+
+    # It is a pure append only if every new bar is newer than the cached ones
+    # and the revisions of the cached bars are unchanged.
+    result = await session.execute(
+        select(func.count(PriceBar.id), func.coalesce(func.sum(PriceBar.revision), 0)).where(
+            PriceBar.asset_id.in_(list(ids.values())), PriceBar.timestamp > entry.version[0]
+        )
+    )
+    appended, appended_revisions = result.one()
+    if appended != new_bars or version[2] - appended_revisions != entry.version[2]:
+        return False
+
+    asset_ids = [ids[symbol] for symbol in symbols]
+    rows = await fetch_closes(session, asset_ids, after=entry.version[0])
+    await asyncio.to_thread(append_closes, entry, rows, asset_ids)
+    entry.version = version
+    entry.payload.clear()
+    return True
+
+
+def append_closes(entry: CacheEntry, rows: List[Tuple[int, datetime, float]], asset_ids: List[int]) -> None:
+    prices = align_prices(rows, asset_ids)
+    values = np.vstack([entry.last_prices, prices.to_numpy(dtype=float)])
+    for row in simple_returns(values):
+        entry.returns.push(row)
+    if len(prices):
+        entry.last_prices = values[-1]
+        entry.last_timestamp = prices.index[-1].to_pydatetime()
+
+
+def render_payload(entry: CacheEntry, columns: List[str], symbols: List[str], benchmark: str) -> bytes:
+    """
+    Serialize the matrices for one benchmark as a JSON document.
+
+    Args:
+        entry: Cache entry whose columns are in `columns` order.
+        columns: Sorted symbols of the entry.
+        symbols: Order of the rows and columns in the result.
+        benchmark: Symbol the betas are computed against.
+    """
+    order = [columns.index(symbol) for symbol in symbols]
+    covariance = entry.returns.covariance()[np.ix_(order, order)]
+    matrices = compute_matrices(covariance, symbols.index(benchmark))
+    header = json.dumps({
+        "symbols": symbols,
+        "benchmark": benchmark,
+        "window": entry.returns.window,
+        "observations": entry.returns.size,
+        "as_of": entry.last_timestamp.isoformat(),
+    })
+    beta = ",".join(f"{json.dumps(symbol)}:{encode_number(value)}" for symbol, value in zip(symbols, matrices["beta"]))
+    return (
+        f'{header[:-1]},"covariance":{encode_array(matrices["covariance"])},'
+        f'"correlation":{encode_array(matrices["correlation"])},"beta":{{{beta}}}}}'
+    ).encode()
+
+
+async def get_cross_asset_matrices(
+    session: AsyncSession, symbols: List[str], benchmark: str, window: int
+) -> bytes:
+    """
+    Return correlation, covariance and beta matrices as serialized JSON.
+
+    Results are cached per (symbol set, window), whatever the order of
+    `symbols`, and keyed on the data version; when only new bars were
+    appended since the cached version the window is updated incrementally
+    instead of recomputed. Values are rounded to SIGNIFICANT_DIGITS digits.
+
+    Args:
+        session: Active database session.
+        symbols: Symbols to include; the benchmark is added if missing.
+        benchmark: Symbol the betas are computed against.
+        window: Number of most recent aligned returns to use.
+
+    Raises:
+        LookupError: If a symbol is unknown.
+        ValueError: If there is not enough overlapping history.
+    """
+    symbols = list(dict.fromkeys(symbols + [benchmark]))
+    columns = sorted(symbols)
+    ids = await resolve_asset_ids(session, columns)
+    version = await fetch_data_version(session, list(ids.values()))
+
+    key: CacheKey = (tuple(columns), window)
+    async with _locks.setdefault(key, asyncio.Lock()):
+        entry = _cache.get(key)
+        if entry is None or (
+            entry.version != version and not await update_entry(session, entry, ids, columns, version)
+        ):
+            logger.info(f"Computing return matrices for {len(symbols)} symbols over {window} bars.")
+            entry = await build_entry(session, ids, columns, benchmark, window, version)
+            _cache[key] = entry
+
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            evicted, _ = _cache.popitem(last=False)
+            _locks.pop(evicted, None)
+
+        payload_key = (tuple(symbols), benchmark)
+        if payload_key not in entry.payload:
+            entry.payload[payload_key] = await asyncio.to_thread(render_payload, entry, columns, symbols, benchmark)
+            if len(entry.payload) > PAYLOADS_PER_ENTRY:
+                del entry.payload[next(iter(entry.payload))]
+        return entry.payload[payload_key]
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MetricValues = Dict[str, float]
+
+
+class Subscriber:
+    """
+    A single push connection and its pending, not yet delivered updates.
+
+    Pending updates are coalesced per symbol: a newer value for a field
+    overwrites the undelivered older one, so a slow consumer holds at most
+    one entry per subscribed symbol instead of an unbounded backlog.
+    """
+
+    def __init__(self) -> None:
+        self.symbols: Set[str] = set()
+        self.pending: Dict[str, MetricValues] = {}
+        self.coalesced: int = 0
+        self._ready = asyncio.Event()
+
+    def push(self, symbol: str, delta: MetricValues) -> None:
+        """Queue a delta for delivery, merging it into any pending one."""
+        if symbol in self.pending:
+            self.pending[symbol].update(delta)
+            self.coalesced += 1
+        else:
+            self.pending[symbol] = dict(delta)
+        self._ready.set()
+
+    async def next_batch(self) -> Dict[str, MetricValues]:
+        """Wait for pending deltas and take all of them."""
+        await self._ready.wait()
+        self._ready.clear()
+        batch, self.pending = self.pending, {}
+        return batch
+
+
+class MetricBroadcaster:
+    """
+    Fan out metric changes to subscribers of the affected symbols.
+
+    Subscribers are indexed by symbol so a publish only touches the
+    connections interested in it. State is per process: each worker only
+    pushes changes committed by its own ingestion runs.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._latest: Dict[str, MetricValues] = {}
+
+    def subscribe(self, subscriber: Subscriber, symbols: Iterable[str]) -> None:
+        """Add symbols to a subscriber and queue their latest known values."""
+        for symbol in symbols:
+            if symbol in subscriber.symbols:
+                continue
+            subscriber.symbols.add(symbol)
+            self._subscribers.setdefault(symbol, set()).add(subscriber)
+            if symbol in self._latest:
+                subscriber.push(symbol, self._latest[symbol])
+
+    def unsubscribe(self, subscriber: Subscriber, symbols: Optional[Iterable[str]] = None) -> None:
+        """Remove symbols from a subscriber, or all of them when none are given."""
+        for symbol in list(subscriber.symbols if symbols is None else symbols):
+            subscriber.symbols.discard(symbol)
+            subscriber.pending.pop(symbol, None)
+            subs = self._subscribers.get(symbol)
+            if subs is not None:
+                subs.discard(subscriber)
+                if not subs:
+                    del self._subscribers[symbol]
+
+    def publish(self, symbol: str, metrics: MetricValues) -> MetricValues:
+        """
+        Record new metric values for a symbol and push the changed fields.
+
+        Args:
+            symbol: Asset symbol the metrics belong to.
+            metrics: Current metric values, possibly including unchanged ones.
+
+        Returns:
+            The delta that was pushed; empty if nothing changed.
+        """
+        previous = self._latest.setdefault(symbol, {})
+        delta = {key: value for key, value in metrics.items() if previous.get(key) != value}
+        if not delta:
+            return delta
+
+        previous.update(delta)
+        for subscriber in self._subscribers.get(symbol, ()):
+            subscriber.push(symbol, delta)
+        return delta
+
+
+broadcaster = MetricBroadcaster()
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.broadcast import broadcaster
+from app.services.search import symbol_index
+from app.services.ingestion import (
+    METRIC_FIELDS,
+    bulk_replace_metrics,
+    bulk_upsert_assets,
+    bulk_upsert_price_bars,
+)
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Source rows parsed, validated and committed per transaction.
+IMPORT_CHUNK_SIZE: int = 50000
+
+KINDS: Tuple[str, ...] = ("bars", "metrics")
+BAR_FIELDS: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+REQUIRED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "bars": ("symbol", "timestamp", "close"),
+    "metrics": ("symbol",) + METRIC_FIELDS,
+}
+
+ProgressCallback = Callable[[Dict[str, int]], None]
+
+
+def detect_format(path: str) -> str:
+    """Infer "parquet" or "csv" from a file extension."""
+    return "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def checkpoint_path(path: str) -> str:
+    return f"{path}.import-progress.json"
+
+
+def load_checkpoint(path: str, kind: str) -> int:
+    """
+    Return the number of source rows already imported from `path`.
+
+    A checkpoint only counts if it was written for the same kind and the
+    file has not changed size or modification time since.
+    """
+    try:
+        with open(checkpoint_path(path)) as handle:
+            checkpoint = json.load(handle)
+    except (OSError, ValueError):
+        return 0
+
+    stat = os.stat(path)
+    if checkpoint.get("kind") != kind or checkpoint.get("size") != stat.st_size or checkpoint.get("mtime_ns") != stat.st_mtime_ns:
+        logger.info(f"Ignoring stale import checkpoint for {path}.")
+        return 0
+    return int(checkpoint.get("rows", 0))
+
+
+def save_checkpoint(path: str, kind: str, rows: int) -> None:
+    """Record the number of committed source rows next to the source file."""
+    stat = os.stat(path)
+    temporary = checkpoint_path(path) + ".tmp"
+    with open(temporary, "w") as handle:
+        json.dump({"kind": kind, "rows": rows, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, handle)
+    os.replace(temporary, checkpoint_path(path))
+
+
+def iter_frames(path: str, fmt: str, chunk_size: int, skip_rows: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet file in DataFrame chunks, skipping already imported rows.
+    """
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1))
+        return
+
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        yield batch.slice(skip_rows).to_pandas()
+        skip_rows = 0
+
+
+def to_naive_utc(values: pd.Series) -> pd.Series:
+    """Parse timestamps, converting timezone-aware ones to naive UTC."""
+    return pd.to_datetime(values, errors="coerce", utc=True).dt.tz_localize(None)
+
+
+def validate_frame(frame: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """
+    Normalize and validate a chunk with vectorized checks.
+
+    Column names are matched case-insensitively. Rows with a missing symbol,
+    an unparseable timestamp, a non-positive price or inconsistent
+    high/low/volume values are dropped; for duplicate keys the last row wins.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    frame = frame.rename(columns=lambda column: str(column).strip().lower())
+    missing = [column for column in REQUIRED_COLUMNS[kind] if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing required columns for {kind}: {', '.join(missing)}")
+
+    numeric = BAR_FIELDS if kind == "bars" else METRIC_FIELDS
+    frame = frame.reindex(columns=["symbol", "timestamp", *numeric])
+    frame["symbol"] = frame["symbol"].astype("string").str.strip()
+    frame["timestamp"] = to_naive_utc(frame["timestamp"])
+    for column in numeric:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+
+    valid = frame["symbol"].notna() & (frame["symbol"] != "")
+    if kind == "bars":
+        valid &= frame["timestamp"].notna() & (frame["close"] > 0)
+        valid &= ~(frame["high"] < frame["low"])
+        valid &= ~(frame["volume"] < 0)
+        key = ["symbol", "timestamp"]
+    else:
+        valid &= frame[list(METRIC_FIELDS)].notna().all(axis=1) & (frame["latest_price"] > 0)
+        frame["timestamp"] = frame["timestamp"].fillna(pd.Timestamp(datetime.utcnow()))
+        key = ["symbol"]
+
+    return frame[valid].drop_duplicates(subset=key, keep="last")
+
+
+def to_records(frame: pd.DataFrame, ids: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Convert a validated chunk into insert parameters keyed by asset_id."""
+    frame = frame.assign(asset_id=frame["symbol"].map(ids)).drop(columns=["symbol"])
+    timestamps = list(frame.pop("timestamp").dt.to_pydatetime())
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    for record, timestamp in zip(records, timestamps):
+        record["timestamp"] = timestamp
+    return records
+
+
+def read_chunk(frames: Iterator[pd.DataFrame], kind: str) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Read the next chunk and validate it, or return None at the end of the file."""
+    frame = next(frames, None)
+    return None if frame is None else (frame, validate_frame(frame, kind))
+
+
+async def import_file(
+    session: AsyncSession,
+    path: str,
+    kind: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    resume: bool = True,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, int]:
+    """
+    Import OHLCV bars or precomputed metrics from a CSV or Parquet file.
+
+    The file is processed in chunks; each chunk is validated with vectorized
+    pandas checks and written with executemany upserts in its own
+    transaction. After every commit a checkpoint is stored next to the file,
+    so an interrupted import resumes after the last committed chunk.
+    Reading, validating and converting a chunk run in a worker thread, so a
+    large import does not stall the event loop.
+
+    Args:
+        session: Active database session.
+        path: Path of the source file.
+        kind: "bars" (symbol, timestamp, open, high, low, close, volume) or
+            "metrics" (symbol, latest_price, change_percent_24h, average_price_7d).
+        fmt: "csv" or "parquet"; inferred from the extension when omitted.
+        chunk_size: Source rows per chunk and transaction.
+        resume: Continue from an existing checkpoint instead of starting over.
+        progress: Called after each chunk with the running totals.
+
+    Returns:
+        Totals of rows read, written and rejected.
+
+    Raises:
+        ValueError: If the kind or format is unknown or a column is missing.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(KINDS)}")
+    fmt = fmt or detect_format(path)
+    if fmt not in ("csv", "parquet"):
+        raise ValueError("format must be csv or parquet")
+
+    skipped = load_checkpoint(path, kind) if resume else 0
+    totals = {"rows_skipped": skipped, "rows_read": 0, "rows_written": 0, "rows_rejected": 0}
+    if skipped:
+        logger.info(f"Resuming import of {path} after {skipped} rows.")
+
+    asset_ids: Dict[str, int] = {}
+    frames = iter_frames(path, fmt, chunk_size, skipped)
+    while (chunk := await asyncio.to_thread(read_chunk, frames, kind)) is not None:
+        frame, valid = chunk
+        await bulk_upsert_assets(session, valid["symbol"].tolist(), asset_ids)
+        records = await asyncio.to_thread(to_records, valid, asset_ids)
+        if kind == "bars":
+            await bulk_upsert_price_bars(session, records)
+        else:
+            await bulk_replace_metrics(session, records)
+        await session.commit()
+        symbol_index.add_new(valid["symbol"])
+
+        if kind == "metrics":
+            for symbol, values in zip(valid["symbol"], valid[list(METRIC_FIELDS)].to_dict("records")):
+                broadcaster.publish(symbol, values)
+
+        totals["rows_read"] += len(frame)
+        totals["rows_written"] += len(records)
+        totals["rows_rejected"] += len(frame) - len(records)
+        await asyncio.to_thread(save_checkpoint, path, kind, skipped + totals["rows_read"])
+        logger.info(f"Imported {skipped + totals['rows_read']} rows from {path}.")
+        if progress is not None:
+            progress(totals)
+
+    if os.path.exists(checkpoint_path(path)):
+        os.remove(checkpoint_path(path))
+    logger.info(f"Import of {path} completed: {totals}")
+    return totals
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.database import SessionLocal
+from app.core.models import Asset, Metric, PriceBar
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the database cursor per chunk.
+EXPORT_CHUNK_SIZE: int = 5000
+
+FORMATS: Dict[str, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# dataset -> (output column, source column, Arrow type alias); the timestamp
+# column of each dataset is the one filtered by `since`/`until`.
+DATASETS: Dict[str, Tuple[Tuple[str, Any, str], ...]] = {
+    "assets": (
+        ("symbol", Asset.symbol, "string"),
+        ("name", Asset.name, "string"),
+        ("last_updated", Asset.last_updated, "timestamp[us]"),
+    ),
+    "metrics": (
+        ("symbol", Asset.symbol, "string"),
+        ("latest_price", Metric.latest_price, "double"),
+        ("change_percent_24h", Metric.change_percent_24h, "double"),
+        ("average_price_7d", Metric.average_price_7d, "double"),
+        ("timestamp", Metric.timestamp, "timestamp[us]"),
+    ),
+    "history": (
+        ("symbol", Asset.symbol, "string"),
+        ("timestamp", PriceBar.timestamp, "timestamp[us]"),
+        ("open", PriceBar.open, "double"),
+        ("high", PriceBar.high, "double"),
+        ("low", PriceBar.low, "double"),
+        ("close", PriceBar.close, "double"),
+        ("volume", PriceBar.volume, "double"),
+    ),
+}
+
+TIME_COLUMNS: Dict[str, Any] = {
+    "assets": Asset.last_updated,
+    "metrics": Metric.timestamp,
+    "history": PriceBar.timestamp,
+}
+
+
+def build_export_query(
+    dataset: str,
+    symbols: Optional[Sequence[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Build the select for a dataset with optional symbol and time filters.
+
+    Raises:
+        ValueError: If the dataset is unknown.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"dataset must be one of: {', '.join(DATASETS)}")
+
+    query = select(*(column for _, column, _ in DATASETS[dataset]))
+    if dataset == "metrics":
+        query = query.select_from(Metric).join(Asset, Asset.id == Metric.asset_id).order_by(Metric.asset_id)
+    elif dataset == "history":
+        query = (
+            query.select_from(PriceBar)
+            .join(Asset, Asset.id == PriceBar.asset_id)
+            .order_by(PriceBar.asset_id, PriceBar.timestamp)
+        )
+    else:
+        query = query.order_by(Asset.id)
+
+    time_column = TIME_COLUMNS[dataset]
+    if symbols:
+        query = query.where(Asset.symbol.in_(symbols))
+    if since is not None:
+        query = query.where(time_column >= since)
+    if until is not None:
+        query = query.where(time_column < until)
+    return query
+
+
+async def stream_chunks(session: AsyncSession, query, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[List[Tuple]]:
+    """Yield query rows in chunks read from a server-side cursor."""
+    result = await session.stream(query)
+    async for partition in result.partitions(chunk_size):
+        yield [tuple(row) for row in partition]
+
+
+def to_text(value: Any) -> Any:
+    """Render datetimes as ISO-8601 for the text formats."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def encode_csv(columns: List[str], chunks: AsyncIterator[List[Tuple]]) -> AsyncIterator[bytes]:
+    """Encode row chunks as CSV with a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in chunks:
+        writer.writerows([[to_text(value) for value in row] for row in rows])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def encode_ndjson(columns: List[str], chunks: AsyncIterator[List[Tuple]]) -> AsyncIterator[bytes]:
+    """Encode row chunks as newline-delimited JSON objects."""
+    async for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=to_text) + "\n" for row in rows
+        ).encode()
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object whose written bytes can be drained between chunks."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+async def encode_arrow(
+    dataset: str, chunks: AsyncIterator[List[Tuple]], parquet: bool = False
+) -> AsyncIterator[bytes]:
+    """Encode row chunks as an Arrow IPC stream, or as Parquet with one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.type_for_alias(alias)) for name, _, alias in DATASETS[dataset]])
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if parquet else pa.ipc.new_stream(sink, schema)
+    try:
+        async for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def stream_export(dataset: str, fmt: str, query) -> AsyncIterator[bytes]:
+    """Run an export query in its own session and yield the encoded bytes."""
+    columns = [name for name, _, _ in DATASETS[dataset]]
+
+    async with SessionLocal() as session:
+        chunks = stream_chunks(session, query)
+        if fmt == "csv":
+            encoded = encode_csv(columns, chunks)
+        elif fmt == "ndjson":
+            encoded = encode_ndjson(columns, chunks)
+        else:
+            encoded = encode_arrow(dataset, chunks, parquet=fmt == "parquet")
+
+        async for data in encoded:
+            if data:
+                yield data
+    logger.info(f"Export of {dataset} as {fmt} completed.")
+
+
+def export_dataset(
+    dataset: str,
+    fmt: str = "csv",
+    symbols: Optional[Sequence[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Validate an export and return a stream of the dataset in the requested format.
+
+    Arguments are checked eagerly so errors surface before any bytes are
+    sent. The stream opens its own session, reads the cursor in chunks of
+    EXPORT_CHUNK_SIZE rows and keeps memory bounded by one chunk.
+
+    Args:
+        dataset: One of "assets", "metrics" or "history".
+        fmt: One of "csv", "ndjson", "arrow" or "parquet".
+        symbols: Only export these symbols.
+        since: Inclusive lower bound on the dataset's timestamp column.
+        until: Exclusive upper bound on the dataset's timestamp column.
+
+    Raises:
+        ValueError: If the dataset or format is unknown, or pyarrow is
+            missing for the arrow and parquet formats.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    if fmt in ("arrow", "parquet"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ValueError("pyarrow is required for arrow and parquet exports") from e
+
+    query = build_export_query(dataset, symbols, since, until)
+    logger.info(f"Exporting {dataset} as {fmt}.")
+    return stream_export(dataset, fmt, query)
@@ -1,35 +1,177 @@
 import logging
-from typing import List, Dict
-from transformers import pipeline, Pipeline
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.model_server import RemoteSummarizer, load_pipeline
 logging.basicConfig(level=logging.INFO)
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Token budget for a single prompt chunk and for the text generated from it.
+# Their sum has to stay within the model context (1024 tokens for distilgpt2).
+CHUNK_MAX_TOKENS: int = 512
+SUMMARY_MAX_NEW_TOKENS: int = 80
+SUMMARY_MIN_NEW_TOKENS: int = 20
+# Number of chunk prompts handed to the model in one forward pass.
+SUMMARY_BATCH_SIZE: int = 8
+# Upper bound on map prompts per summary. Larger universes keep their top
+# movers and roll the remaining assets up into one statistics line, so the
+# number of model calls does not grow with the number of assets.
+MAX_MAP_CHUNKS: int = 2 * SUMMARY_BATCH_SIZE
+
+# Unix socket of a shared model server (`python -m app.cli serve-model`).
+# When set, this process forwards generation requests instead of loading the model.
+MODEL_SOCKET: Optional[str] = os.getenv("GENAI_MODEL_SOCKET")
+
 # Initialize the text generation pipeline once
-def get_summarizer() -> Pipeline:
+def get_summarizer() -> Any:
     """
-    Initialize and return the text generation pipeline.
+    Return the local text generation pipeline, or a client of the shared
+    model server when GENAI_MODEL_SOCKET is set.
     """
-    return pipeline("text-generation", model="distilgpt2")
+    if MODEL_SOCKET:
+        logger.info(f"Using the model server at {MODEL_SOCKET}.")
+        return RemoteSummarizer(MODEL_SOCKET)
+    return load_pipeline()
 
-summarizer: Pipeline = get_summarizer()
+summarizer = get_summarizer()
 
 
-def format_asset_summary(data: List[Dict[str, float]]) -> str:
+def format_asset_line(asset: Dict[str, float]) -> str:
     """
-    Create a summary text from a list of asset metric dictionaries.
+    Create the summary sentence for a single asset metric dictionary.
     """
-    return " ".join(
+    return (
         f"{asset['symbol']} had a {asset['change_percent_24h']}% change in the last 24 hours, "
         f"with a weekly average price of ${asset['average_price_7d']}."
-        for asset in data
     )
 
 
+def format_asset_summary(data: List[Dict[str, float]]) -> str:
+    """
+    Create a summary text from a list of asset metric dictionaries.
+    """
+    return " ".join(format_asset_line(asset) for asset in data)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the model tokens in a piece of text.
+    """
+    return len(summarizer.tokenizer.encode(text))
+
+
+def chunk_texts(
+    texts: List[str],
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    counter: Callable[[str], int] = count_tokens,
+) -> List[str]:
+    """
+    Greedily pack texts into space-joined chunks of at most `max_tokens` tokens.
+
+    A single text longer than the budget becomes a chunk of its own; the
+    pipeline truncates it rather than dropping it.
+
+    Args:
+        texts: Sentences to pack, in order.
+        max_tokens: Token budget per chunk.
+        counter: Function returning the token count of a text.
+
+    Returns:
+        A list of chunk strings.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        tokens = counter(text)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def format_rollup_line(assets: List[Dict[str, float]]) -> str:
+    """
+    Create one sentence with aggregate statistics for assets left out of the prompt.
+    """
+    changes = [asset["change_percent_24h"] for asset in assets]
+    up = sum(change > 0 for change in changes)
+    down = sum(change < 0 for change in changes)
+    return (
+        f"{len(assets)} other assets had an average {sum(changes) / len(changes):.2f}% change "
+        f"in the last 24 hours, {up} up and {down} down."
+    )
+
+
+def select_lines(assets: List[Dict[str, float]], keep: int) -> List[str]:
+    """
+    Summary lines for the assets: every asset if there are at most `keep`,
+    otherwise the `keep` largest movers followed by a rollup line for the rest.
+    """
+    if len(assets) <= keep:
+        return [format_asset_line(asset) for asset in assets]
+    movers = sorted(assets, key=lambda asset: abs(asset["change_percent_24h"]), reverse=True)
+    return [format_asset_line(asset) for asset in movers[:keep]] + [format_rollup_line(movers[keep:])]
+
+
+def build_chunks(data: List[Dict[str, float]], max_chunks: int = MAX_MAP_CHUNKS) -> List[str]:
+    """
+    Split asset metrics into token-bounded prompt chunks.
+
+    When the assets do not fit into `max_chunks` chunks, the number of assets
+    listed individually is reduced, keeping the top movers plus a rollup line
+    for the rest, until they fit.
+    """
+    if not data:
+        return []
+    counter = lru_cache(maxsize=None)(count_tokens)
+
+    keep = len(data)
+    chunks = chunk_texts(select_lines(data, keep), CHUNK_MAX_TOKENS, counter)
+    while len(chunks) > max_chunks and keep > 0:
+        keep = min(keep - 1, keep * max_chunks // len(chunks))
+        chunks = chunk_texts(select_lines(data, keep), CHUNK_MAX_TOKENS, counter)
+
+    if keep < len(data):
+        logger.info(f"Summarizing the top {keep} of {len(data)} assets individually.")
+    return chunks
+
+
+def run_model(prompts: List[str], return_full_text: bool) -> List[str]:
+    """
+    Run the text generation model over a batch of prompts.
+    """
+    results = summarizer(
+        prompts,
+        batch_size=SUMMARY_BATCH_SIZE,
+        truncation=True,
+        max_new_tokens=SUMMARY_MAX_NEW_TOKENS,
+        min_new_tokens=SUMMARY_MIN_NEW_TOKENS,
+        length_penalty=2.0,
+        no_repeat_ngram_size=3,
+        return_full_text=return_full_text,
+    )
+    return [result[0]["generated_text"].strip() for result in results]
+
+
 def generate_summary(data: List[Dict[str, float]]) -> str:
     """
     Generate a summary based on the asset metrics using a text generation model.
 
+    Assets are split into at most MAX_MAP_CHUNKS token-bounded chunks which
+    are summarized in batches (map), and the partial summaries are chunked
+    and summarized again until a single prompt remains (reduce). Large
+    universes are trimmed to their top movers plus rollup statistics, so the
+    number of model calls stays bounded.
+
     Args:
         data: A list of dictionaries, each containing asset metrics.
 
@@ -37,21 +179,19 @@ def generate_summary(data: List[Dict[str, float]]) -> str:
         A generated summary string.
     """
     try:
-        logger.info("Generating summary from asset data.")
+        logger.info(f"Generating summary from data for {len(data)} assets.")
+
+        chunks = build_chunks(data)
 
-        input_text: str = format_asset_summary(data)
-        max_tokens: int = 200
+        while len(chunks) > 1:
+            logger.info(f"Summarizing {len(chunks)} chunks.")
+            partials = run_model(chunks, return_full_text=False)
+            chunks = chunk_texts(partials)
 
-        results = summarizer(
-            input_text,
-            max_length=max_tokens,
-            min_length=50,
-            length_penalty=2.0,
-            no_repeat_ngram_size=3,
-        )
+        summary = run_model(chunks, return_full_text=True)[0]
 
         logger.info("Summary generation successful.")
-        return results[0]["generated_text"]
+        return summary
 
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
@@ -1,15 +1,25 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 
 import FinanceDataReader as fdr
+import pandas as pd
+from sqlalchemy import case, delete, func, or_, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.core.models import Asset, Metric
+from app.core.models import Asset, Metric, PriceBar
+from app.services.broadcast import broadcaster
+from app.services.search import symbol_index
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+METRIC_FIELDS: tuple[str, ...] = ("latest_price", "change_percent_24h", "average_price_7d")
+# FinanceDataReader column -> PriceBar column
+BAR_COLUMNS: Dict[str, str] = {"Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume"}
+
 
 def get_date_range(days_back: int = 15) -> tuple[str, str]:
     """
@@ -20,6 +30,17 @@ def get_date_range(days_back: int = 15) -> tuple[str, str]:
     return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
 
 
+def frame_to_bars(data: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a FinanceDataReader frame into PriceBar rows keyed by its date index.
+    """
+    frame = data.reindex(columns=list(BAR_COLUMNS)).rename(columns=BAR_COLUMNS).astype(float)
+    frame = frame[frame["close"].notna()]
+    timestamps = pd.to_datetime(frame.index).to_pydatetime()
+    rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    return [{"timestamp": timestamp, **row} for timestamp, row in zip(timestamps, rows)]
+
+
 async def fetch_asset_data(symbol: str) -> Optional[Dict[str, Any]]:
     """
     Fetch asset data using FinanceDataReader and calculate metrics.
@@ -33,7 +54,8 @@ async def fetch_asset_data(symbol: str) -> Optional[Dict[str, Any]]:
     try:
         logger.info(f"Fetching data for {symbol}...")
         start_date, end_date = get_date_range()
-        data = fdr.DataReader(symbol, start=start_date, end=end_date)
+        # The reader does blocking HTTP; run it in a thread so the event loop keeps serving.
+        data = await asyncio.to_thread(fdr.DataReader, symbol, start=start_date, end=end_date)
 
         if data.empty:
             logger.warning(f"No data found for {symbol}.")
@@ -48,6 +70,7 @@ async def fetch_asset_data(symbol: str) -> Optional[Dict[str, Any]]:
             "latest_price": latest_price,
             "change_percent_24h": round(change_percent_24h, 2),
             "average_price_7d": round(average_price_7d, 2),
+            "bars": frame_to_bars(data),
         }
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {e}")
@@ -72,6 +95,7 @@ async def upsert_asset(session: AsyncSession, symbol: str) -> Asset:
         asset = Asset(symbol=symbol, name=symbol)
         session.add(asset)
         await session.commit()
+        symbol_index.add(symbol, asset.name)
         logger.info(f"Asset {symbol} added to the database.")
 
     return asset
@@ -81,6 +105,9 @@ async def upsert_metric(session: AsyncSession, asset_id: int, metrics: Dict[str,
     """
     Insert or update metrics in the database.
 
+    The metric timestamp and the asset's last_updated are set to the current
+    time, so incremental exports filtered on them pick up refreshed metrics.
+
     Args:
         session: Active database session.
         asset_id: Foreign key reference to the asset.
@@ -88,11 +115,13 @@ async def upsert_metric(session: AsyncSession, asset_id: int, metrics: Dict[str,
     """
     result = await session.execute(select(Metric).where(Metric.asset_id == asset_id))
     existing_metric = result.scalar_one_or_none()
+    now = datetime.utcnow()
 
     if existing_metric:
         existing_metric.latest_price = metrics["latest_price"]
         existing_metric.change_percent_24h = metrics["change_percent_24h"]
         existing_metric.average_price_7d = metrics["average_price_7d"]
+        existing_metric.timestamp = now
         logger.info(f"Metric data for asset ID {asset_id} updated.")
     else:
         new_metric = Metric(
@@ -100,13 +129,142 @@ async def upsert_metric(session: AsyncSession, asset_id: int, metrics: Dict[str,
             latest_price=metrics["latest_price"],
             change_percent_24h=metrics["change_percent_24h"],
             average_price_7d=metrics["average_price_7d"],
+            timestamp=now,
         )
         session.add(new_metric)
         logger.info(f"Metric data for asset ID {asset_id} added.")
 
+    await session.execute(update(Asset).where(Asset.id == asset_id).values(last_updated=now))
     await session.commit()
 
 
+async def bulk_upsert_price_bars(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert or update price bars for any number of assets in a single executemany.
+
+    Updating a bar with different values bumps its revision; re-upserting
+    identical values leaves it unchanged. The caller is responsible for
+    committing.
+
+    Args:
+        session: Active database session.
+        rows: Rows with asset_id, timestamp, open, high, low, close and volume.
+    """
+    if not rows:
+        return
+
+    stmt = insert(PriceBar)
+    bars = PriceBar.__table__.c
+    changed = or_(*(bars[column].is_not(stmt.excluded[column]) for column in BAR_COLUMNS.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PriceBar.asset_id, PriceBar.timestamp],
+        set_={
+            **{column: stmt.excluded[column] for column in BAR_COLUMNS.values()},
+            "revision": case((changed, bars.revision + 1), else_=bars.revision),
+        },
+    )
+    await session.execute(stmt, rows)
+
+
+async def bulk_merge_price_bars(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Merge partial bars (e.g. built from ticks) into the stored bars of their day.
+
+    Unlike bulk_upsert_price_bars, a stored bar is not overwritten: its open
+    is kept, high and low only widen, the close is replaced and the row's
+    volume is added to the stored volume. Several writers can therefore each
+    merge the ticks they saw into the same bar. The caller is responsible
+    for committing.
+
+    Args:
+        session: Active database session.
+        rows: Rows with asset_id, timestamp, open, high, low, close and the
+            volume traded since the row's previous merge (None if unknown).
+    """
+    if not rows:
+        return
+
+    stmt = insert(PriceBar)
+    bars, new = PriceBar.__table__.c, stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PriceBar.asset_id, PriceBar.timestamp],
+        set_={
+            "open": func.coalesce(bars.open, new.open),
+            "high": func.max(func.coalesce(bars.high, new.high), new.high),
+            "low": func.min(func.coalesce(bars.low, new.low), new.low),
+            "close": new.close,
+            "volume": case((new.volume.is_(None), bars.volume), else_=func.coalesce(bars.volume, 0) + new.volume),
+            "revision": bars.revision + 1,
+        },
+    )
+    await session.execute(stmt, rows)
+
+
+async def upsert_price_bars(session: AsyncSession, asset_id: int, bars: List[Dict[str, Any]]) -> None:
+    """
+    Insert or update price bars for an asset.
+
+    The caller is responsible for committing.
+
+    Args:
+        session: Active database session.
+        asset_id: Foreign key reference to the asset.
+        bars: Rows with timestamp, open, high, low, close and volume.
+    """
+    if not bars:
+        return
+
+    await bulk_upsert_price_bars(session, [{"asset_id": asset_id, **bar} for bar in bars])
+    logger.info(f"{len(bars)} price bars for asset ID {asset_id} stored.")
+
+
+async def bulk_upsert_assets(session: AsyncSession, symbols: List[str], known: Dict[str, int]) -> Dict[str, int]:
+    """
+    Make sure assets exist for the given symbols and return their IDs.
+
+    Only symbols missing from `known` touch the database; `known` is
+    updated in place so callers can reuse it across batches. The caller is
+    responsible for committing.
+
+    Args:
+        session: Active database session.
+        symbols: Asset symbols, possibly with duplicates.
+        known: Cache of symbol to asset ID mappings.
+
+    Returns:
+        The updated `known` mapping.
+    """
+    missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in known]
+    if missing:
+        await session.execute(
+            insert(Asset).on_conflict_do_nothing(index_elements=[Asset.symbol]),
+            [{"symbol": symbol, "name": symbol} for symbol in missing],
+        )
+        result = await session.execute(select(Asset.symbol, Asset.id).where(Asset.symbol.in_(missing)))
+        known.update(result.all())
+    return known
+
+
+async def bulk_replace_metrics(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Replace the metric rows of the given assets in one delete and one executemany,
+    and set the assets' last_updated to the current time.
+
+    The caller is responsible for committing.
+
+    Args:
+        session: Active database session.
+        rows: One row per asset with asset_id and the metric fields.
+    """
+    if not rows:
+        return
+
+    asset_ids = [row["asset_id"] for row in rows]
+    await session.execute(delete(Metric).where(Metric.asset_id.in_(asset_ids)))
+    await session.execute(insert(Metric), rows)
+    await session.execute(update(Asset).where(Asset.id.in_(asset_ids)).values(last_updated=datetime.utcnow()))
+
+
 async def ingest_data(session: AsyncSession, symbols: List[str] = ["BTC-USD", "ETH-USD", "TSLA"]) -> None:
     """
     Ingest asset metrics into the database.
@@ -125,7 +283,9 @@ async def ingest_data(session: AsyncSession, symbols: List[str] = ["BTC-USD", "E
                     break
 
                 asset = await upsert_asset(session, symbol)
+                await upsert_price_bars(session, asset.id, data.get("bars", []))
                 await upsert_metric(session, asset.id, data)
+                broadcaster.publish(symbol, {field: float(data[field]) for field in METRIC_FIELDS})
 
                 break  # Success, break retry loop
             except Exception as e:
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_NAME: str = "distilgpt2"
+# Requests waiting for the model beyond this are refused instead of queued.
+MAX_QUEUE: int = 64
+CLIENT_TIMEOUT: float = 300.0
+
+# Frames are a 4-byte big-endian length followed by a UTF-8 JSON document.
+HEADER = struct.Struct(">I")
+
+
+def load_pipeline():
+    """
+    Load the text generation pipeline, configured for batched prompts.
+    """
+    from transformers import pipeline
+
+    generator = pipeline("text-generation", model=MODEL_NAME)
+    # GPT-2 has no pad token; reuse EOS and pad on the left so prompts can be batched.
+    if generator.tokenizer.pad_token_id is None:
+        generator.tokenizer.pad_token_id = generator.model.config.eos_token_id
+    generator.tokenizer.padding_side = "left"
+    return generator
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message).encode()
+    return HEADER.pack(len(payload)) + payload
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Model server closed the connection.")
+        data.extend(chunk)
+    return bytes(data)
+
+
+class TokenCounter:
+    """
+    Minimal tokenizer for counting tokens, built on the `tokenizers` package.
+
+    Importing transformers also imports torch, which would cost each API
+    worker several hundred MB just to count tokens.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME) -> None:
+        from tokenizers import Tokenizer
+
+        self._tokenizer = Tokenizer.from_pretrained(model_name)
+
+    def encode(self, text: str) -> List[int]:
+        return self._tokenizer.encode(text, add_special_tokens=False).ids
+
+
+class RemoteSummarizer:
+    """
+    Drop-in replacement for the local pipeline that forwards calls to a
+    model server over a Unix socket.
+
+    Only a TokenCounter is loaded in-process; transformers, torch and the
+    model weights live in the server.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = CLIENT_TIMEOUT) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.tokenizer = TokenCounter()
+
+    def __call__(self, inputs: Any, **kwargs: Any) -> Any:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(encode_frame({"inputs": inputs, "kwargs": kwargs}))
+            (size,) = HEADER.unpack(recv_exactly(sock, HEADER.size))
+            response = json.loads(recv_exactly(sock, size))
+
+        if "error" in response:
+            raise RuntimeError(f"Model server error: {response['error']}")
+        return response["results"]
+
+
+class ModelServer:
+    """
+    Serve one shared pipeline to all API workers over a Unix socket.
+
+    Requests from every connection go through one bounded queue and are run
+    one at a time on a single inference thread, so the model's CPU threads
+    are not contended by concurrent requests.
+    """
+
+    def __init__(self, socket_path: str, max_queue: int = MAX_QUEUE) -> None:
+        self.socket_path = socket_path
+        self.queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = asyncio.Queue(maxsize=max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self.pipeline = None
+
+    async def run_inference(self) -> None:
+        """Take queued requests and run them on the inference thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            request, future = await self.queue.get()
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, lambda: self.pipeline(request["inputs"], **request.get("kwargs", {}))
+                )
+                if not future.done():
+                    future.set_result({"results": results})
+            except Exception as e:
+                logger.error(f"Inference failed: {e}")
+                if not future.done():
+                    future.set_result({"error": str(e)})
+            finally:
+                self.queue.task_done()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer framed requests from one client connection."""
+        try:
+            while True:
+                try:
+                    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+                    request = json.loads(await reader.readexactly(size))
+                except asyncio.IncompleteReadError:
+                    break
+
+                future = asyncio.get_running_loop().create_future()
+                try:
+                    self.queue.put_nowait((request, future))
+                    response = await future
+                except asyncio.QueueFull:
+                    response = {"error": "Model server is busy."}
+
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except Exception as e:
+            logger.error(f"Model server connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        """Load the model and serve requests until cancelled."""
+        loop = asyncio.get_running_loop()
+        logger.info(f"Loading {MODEL_NAME} for the model server.")
+        self.pipeline = await loop.run_in_executor(self.executor, load_pipeline)
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        worker = asyncio.create_task(self.run_inference())
+        logger.info(f"Model server listening on {self.socket_path}.")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+            self.executor.shutdown(wait=False)
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+async def serve_model(socket_path: str, max_queue: Optional[int] = None) -> None:
+    """Run a model server on `socket_path`."""
+    await ModelServer(socket_path, max_queue or MAX_QUEUE).serve()
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import re
+from bisect import bisect_left, insort
+from itertools import takewhile
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.database import SessionLocal
+from app.core.models import Asset
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Typos tolerated by the fuzzy fallback: one for short queries, two from FUZZY_LONG_QUERY chars.
+MAX_EDIT_DISTANCE: int = 2
+FUZZY_LONG_QUERY: int = 5
+# Shorter queries are matched by prefix only; a typo in one or two characters is noise.
+FUZZY_MIN_QUERY: int = 3
+DEFAULT_LIMIT: int = 10
+# Seconds between checks for assets created or deleted by other workers.
+REFRESH_INTERVAL: float = 30.0
+
+# Match kinds in ranking order.
+EXACT, SYMBOL_PREFIX, NAME_PREFIX, FUZZY = "exact", "symbol", "name", "fuzzy"
+
+WORD_SPLIT = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    return text.strip().lower()
+
+
+def name_words(name: str) -> Set[str]:
+    """Lowercase words of an asset name, e.g. "BTC-USD" -> {"btc", "usd"}."""
+    return {word for word in WORD_SPLIT.split(normalize(name)) if word}
+
+
+def deletions(key: str, depth: int = MAX_EDIT_DISTANCE) -> Dict[str, int]:
+    """
+    Map the key and every string obtained by deleting up to `depth`
+    characters (never all of them) to the fewest deletions producing it.
+    """
+    variants = {key: 0}
+    frontier = {key}
+    for count in range(1, depth + 1):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier if len(variant) > 1 for i in range(len(variant))}
+        for variant in frontier:
+            variants.setdefault(variant, count)
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or limit + 1 once it exceeds `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SymbolIndex:
+    """
+    In-memory autocomplete index over asset symbols and names.
+
+    Symbols and name words are kept in sorted lists of (key, symbol) pairs,
+    so a prefix lookup is a bisect followed by a scan of the matching run.
+    For typo tolerance every key is also indexed by its deletion variants
+    (up to MAX_EDIT_DISTANCE characters removed); a misspelled query shares a
+    variant with the intended key, and candidates are confirmed with an
+    edit-distance check.
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[str, str] = {}
+        self._symbol_keys: List[Tuple[str, str]] = []
+        self._word_keys: List[Tuple[str, str]] = []
+        # Deletion variant -> {key: deletions from key to variant}
+        self._variants: Dict[str, Dict[str, int]] = {}
+        # Highest asset ID read from the database; refreshes only read newer rows.
+        self.loaded_through_id = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _keys(self, symbol: str, name: str) -> Set[str]:
+        return {normalize(symbol)} | name_words(name)
+
+    def _insert(self, symbol: str, name: str, place) -> None:
+        self.names[symbol] = name
+        place(self._symbol_keys, (normalize(symbol), symbol))
+        for word in name_words(name):
+            place(self._word_keys, (word, symbol))
+        for key in self._keys(symbol, name):
+            for variant, count in deletions(key).items():
+                self._variants.setdefault(variant, {})[key] = count
+
+    def add(self, symbol: str, name: Optional[str] = None) -> None:
+        """Index an asset, replacing its entries if the name changed."""
+        name = name or symbol
+        if self.names.get(symbol) == name:
+            return
+        if symbol in self.names:
+            self.remove(symbol)
+        self._insert(symbol, name, insort)
+
+    def add_many(self, assets: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Index many assets, appending new ones and sorting once."""
+        for symbol, name in assets:
+            if symbol in self.names:
+                self.add(symbol, name)
+            else:
+                self._insert(symbol, name or symbol, list.append)
+        self._symbol_keys.sort()
+        self._word_keys.sort()
+
+    def add_new(self, symbols: Iterable[str]) -> None:
+        """
+        Index symbols not known yet, named after themselves as bulk_upsert_assets
+        creates them. Call after the transaction creating them has committed.
+        """
+        self.add_many((symbol, symbol) for symbol in symbols if symbol not in self.names)
+
+    def remove(self, symbol: str) -> None:
+        name = self.names.pop(symbol, None)
+        if name is None:
+            return
+
+        def discard(keys: List[Tuple[str, str]], entry: Tuple[str, str]) -> None:
+            i = bisect_left(keys, entry)
+            if i < len(keys) and keys[i] == entry:
+                del keys[i]
+
+        discard(self._symbol_keys, (normalize(symbol), symbol))
+        for word in name_words(name):
+            discard(self._word_keys, (word, symbol))
+
+        # Keep a key's variants while another asset still uses the key.
+        in_use = {normalize(other) for other in self.names}
+        for key in self._keys(symbol, name):
+            if key in in_use or self._equal(self._word_keys, key):
+                continue
+            for variant in deletions(key):
+                keys = self._variants.get(variant)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del self._variants[variant]
+
+    def clear(self) -> None:
+        self.names.clear()
+        self._symbol_keys.clear()
+        self._word_keys.clear()
+        self._variants.clear()
+        self.loaded_through_id = 0
+
+    @staticmethod
+    def _prefix(keys: List[Tuple[str, str]], prefix: str) -> Iterable[Tuple[str, str]]:
+        """Entries whose key starts with `prefix`, in key order."""
+        for i in range(bisect_left(keys, (prefix,)), len(keys)):
+            if not keys[i][0].startswith(prefix):
+                break
+            yield keys[i]
+
+    @classmethod
+    def _equal(cls, keys: List[Tuple[str, str]], key: str) -> List[str]:
+        """Symbols of entries whose key is exactly `key`; they lead its prefix run."""
+        return [symbol for _, symbol in takewhile(lambda entry: entry[0] == key, cls._prefix(keys, key))]
+
+    def _fuzzy(self, query: str) -> List[Tuple[int, str, str]]:
+        """(distance, key, symbol) of keys within the allowed edit distance."""
+        limit = MAX_EDIT_DISTANCE if len(query) >= FUZZY_LONG_QUERY else 1
+        candidates: Set[str] = set()
+        for variant in deletions(query, limit):
+            for key, count in self._variants.get(variant, {}).items():
+                # Keys are indexed to MAX_EDIT_DISTANCE deletions; a tighter limit needs fewer.
+                if count <= limit:
+                    candidates.add(key)
+
+        matches = []
+        for key in candidates:
+            distance = edit_distance(query, key, limit)
+            if distance > limit:
+                continue
+            for keys in (self._symbol_keys, self._word_keys):
+                matches.extend((distance, key, symbol) for symbol in self._equal(keys, key))
+        return sorted(matches)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, str]]:
+        """
+        Rank assets for an autocomplete query.
+
+        Exact symbol matches come first, then symbol prefixes, then name word
+        prefixes and finally fuzzy matches, each group in key order. The
+        fuzzy fallback only runs when the prefix matches do not fill `limit`.
+
+        Returns:
+            Up to `limit` dicts with symbol, name and match kind.
+        """
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        results: Dict[str, str] = {}
+
+        def collect(symbols: Iterable[str], kind: str) -> bool:
+            for symbol in symbols:
+                if symbol not in results:
+                    results[symbol] = kind
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        if not (
+            collect(self._equal(self._symbol_keys, query), EXACT)
+            or collect((symbol for _, symbol in self._prefix(self._symbol_keys, query)), SYMBOL_PREFIX)
+            or collect((symbol for _, symbol in self._prefix(self._word_keys, query)), NAME_PREFIX)
+            or len(query) < FUZZY_MIN_QUERY
+        ):
+            collect((symbol for _, _, symbol in self._fuzzy(query)), FUZZY)
+
+        return [{"symbol": symbol, "name": self.names[symbol], "match": kind} for symbol, kind in results.items()]
+
+
+async def load_symbol_index(session: AsyncSession) -> int:
+    """
+    Rebuild the search index from the assets table.
+
+    Returns:
+        Number of indexed assets.
+    """
+    result = await session.execute(select(Asset.id, Asset.symbol, Asset.name))
+    rows = result.all()
+    symbol_index.clear()
+    symbol_index.add_many((symbol, name) for _, symbol, name in rows)
+    symbol_index.loaded_through_id = max((row[0] for row in rows), default=0)
+    logger.info(f"Symbol search index loaded with {len(symbol_index)} assets.")
+    return len(symbol_index)
+
+
+async def refresh_symbol_index(session: AsyncSession) -> int:
+    """
+    Bring the index up to date with assets written by other processes.
+
+    Assets newer than the last one read are added incrementally; if the
+    table then still holds a different number of assets than the index
+    (e.g. after /clear_db on another worker), the index is rebuilt.
+
+    Returns:
+        Number of indexed assets.
+    """
+    result = await session.execute(
+        select(Asset.id, Asset.symbol, Asset.name).where(Asset.id > symbol_index.loaded_through_id)
+    )
+    rows = result.all()
+    if rows:
+        symbol_index.add_many((symbol, name) for _, symbol, name in rows)
+        symbol_index.loaded_through_id = max(row[0] for row in rows)
+
+    count = (await session.execute(select(func.count(Asset.id)))).scalar_one()
+    if count != len(symbol_index):
+        return await load_symbol_index(session)
+    return len(symbol_index)
+
+
+async def refresh_symbol_index_periodically(interval: float = REFRESH_INTERVAL) -> None:
+    """Refresh the index every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with SessionLocal() as session:
+                await refresh_symbol_index(session)
+        except Exception as e:
+            logger.error(f"Error refreshing the symbol search index: {e}")
+
+
+symbol_index = SymbolIndex()
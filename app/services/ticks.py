@@ -0,0 +1,402 @@
+import asyncio
+import logging
+import math
+from contextlib import suppress
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.database import SessionLocal
+from app.core.models import Asset, PriceBar
+from app.services.broadcast import broadcaster
+from app.services.ingestion import bulk_merge_price_bars, bulk_replace_metrics, bulk_upsert_assets
+from app.services.search import symbol_index
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Daily closes kept per symbol, matching the 7-day average of fetch_asset_data.
+WINDOW: int = 7
+INITIAL_CAPACITY: int = 1024
+# Seconds between periodic flushes, and dirty symbols that force an early one.
+FLUSH_INTERVAL: float = 1.0
+MAX_DIRTY: int = 10000
+
+# (symbol, price, timestamp, volume)
+Tick = Tuple[str, float, datetime, Optional[float]]
+
+
+class RollingMetrics:
+    """
+    Per-symbol rolling state in flat NumPy arrays, one row per symbol.
+
+    Each symbol keeps a ring buffer of its last WINDOW daily closes, a
+    running sum of that buffer and the current day's open/high/low/volume.
+    A tick either revises the current day's close or starts a new day, so
+    latest price, 24h change and 7-day average are maintained in O(1)
+    without re-reading history. Volume traded since the bar was last taken
+    for writing is tracked separately, so it can be added to a stored bar.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        self.index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate (or grow, keeping existing rows) every per-symbol array."""
+        layout = {
+            "closes": ((capacity, WINDOW), 0.0, np.float64),
+            "sums": (capacity, 0.0, np.float64),
+            "head": (capacity, 0, np.int8),
+            "count": (capacity, 0, np.int8),
+            "day": (capacity, -1, np.int32),
+            "opens": (capacity, np.nan, np.float64),
+            "highs": (capacity, np.nan, np.float64),
+            "lows": (capacity, np.nan, np.float64),
+            "volumes": (capacity, np.nan, np.float64),
+            "pending_volumes": (capacity, 0.0, np.float64),
+        }
+        for name, (shape, fill, dtype) in layout.items():
+            grown = np.full(shape, fill, dtype=dtype)
+            previous = getattr(self, name, None)
+            if previous is not None:
+                grown[: len(previous)] = previous
+            setattr(self, name, grown)
+
+    def slot(self, symbol: str) -> int:
+        """Return the row of a symbol, adding it (and growing the arrays) if new."""
+        i = self.index.get(symbol)
+        if i is None:
+            i = len(self.symbols)
+            if i == len(self.sums):
+                self._allocate(2 * len(self.sums))
+            self.index[symbol] = i
+            self.symbols.append(symbol)
+        return i
+
+    def update(self, symbol: str, price: float, day: int, volume: Optional[float] = None) -> bool:
+        """
+        Apply one trade or bar close.
+
+        Args:
+            symbol: Asset symbol.
+            price: Trade or close price.
+            day: Date ordinal of the tick.
+            volume: Traded volume to add to the day, if known.
+
+        Returns:
+            False if the tick belongs to a day older than the current one
+            and was ignored.
+        """
+        i = self.slot(symbol)
+        current_day = self.day[i]
+
+        if day == current_day:
+            h = self.head[i]
+            self.sums[i] += price - self.closes[i, h]
+            self.closes[i, h] = price
+            self.highs[i] = max(self.highs[i], price)
+            self.lows[i] = min(self.lows[i], price)
+            if volume is not None:
+                self.volumes[i] = volume if math.isnan(self.volumes[i]) else self.volumes[i] + volume
+                self.pending_volumes[i] += volume
+            return True
+
+        if day < current_day:
+            return False
+
+        # New day: advance the ring, evicting the oldest close once it is full.
+        h = (self.head[i] + 1) % WINDOW if self.count[i] else 0
+        if self.count[i] == WINDOW:
+            self.closes[i, h] = price
+            # Re-derive the sum once per day so rounding errors cannot accumulate.
+            self.sums[i] = self.closes[i].sum()
+        else:
+            self.closes[i, h] = price
+            self.sums[i] += price
+            self.count[i] += 1
+        self.head[i] = h
+        self.day[i] = day
+        self.opens[i] = self.highs[i] = self.lows[i] = price
+        self.volumes[i] = np.nan if volume is None else volume
+        self.pending_volumes[i] = 0.0 if volume is None else volume
+        return True
+
+    def seed_bar(
+        self,
+        symbol: str,
+        day: int,
+        open: Optional[float],
+        high: Optional[float],
+        low: Optional[float],
+        close: float,
+        volume: Optional[float],
+    ) -> None:
+        """
+        Load a stored daily bar, oldest first, as the state for its day.
+
+        Bars not newer than the symbol's current day are ignored, so seeding
+        never overwrites a day that ticks have already updated.
+        """
+        i = self.slot(symbol)
+        if day <= self.day[i]:
+            return
+        self.update(symbol, close, day)
+        self.opens[i] = close if open is None else open
+        self.highs[i] = close if high is None else high
+        self.lows[i] = close if low is None else low
+        self.volumes[i] = np.nan if volume is None else volume
+
+    def copy_row(self, symbol: str, other: "RollingMetrics") -> None:
+        """Replace the state of a symbol with its row in `other`, keeping pending volume."""
+        i, j = self.slot(symbol), other.index[symbol]
+        for name in ("closes", "sums", "head", "count", "day", "opens", "highs", "lows", "volumes"):
+            getattr(self, name)[i] = getattr(other, name)[j]
+
+    def metrics(self, symbol: str) -> Dict[str, float]:
+        """Latest price, 24h change and 7-day average, rounded like fetch_asset_data."""
+        i = self.index[symbol]
+        h = self.head[i]
+        latest = float(self.closes[i, h])
+        change = 0.0
+        if self.count[i] > 1:
+            previous = self.closes[i, (h - 1) % WINDOW]
+            change = round(float((latest - previous) / previous * 100), 2)
+        return {
+            "latest_price": latest,
+            "change_percent_24h": change,
+            "average_price_7d": round(float(self.sums[i] / self.count[i]), 2),
+        }
+
+    def bar(self, symbol: str) -> Dict[str, object]:
+        """The current day's bar as a PriceBar row without asset_id."""
+        i = self.index[symbol]
+
+        def value(array: np.ndarray) -> Optional[float]:
+            return None if math.isnan(array[i]) else float(array[i])
+
+        return {
+            "timestamp": datetime.combine(date.fromordinal(int(self.day[i])), datetime.min.time()),
+            "open": value(self.opens),
+            "high": value(self.highs),
+            "low": value(self.lows),
+            "close": float(self.closes[i, self.head[i]]),
+            "volume": value(self.volumes),
+        }
+
+    def take_bar(self, symbol: str) -> Dict[str, object]:
+        """
+        The current day's bar with only the volume traded since the previous
+        call, for bulk_merge_price_bars. Resets that volume to zero.
+        """
+        i = self.index[symbol]
+        pending = float(self.pending_volumes[i])
+        self.pending_volumes[i] = 0.0
+        return {**self.bar(symbol), "volume": pending or None}
+
+
+def to_day(timestamp: datetime) -> int:
+    """UTC date ordinal of a timestamp; naive timestamps are taken as UTC."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.toordinal()
+
+
+async def load_recent_bars(session: AsyncSession, state: RollingMetrics, symbols: List[str]) -> None:
+    """Seed `state` with the last WINDOW stored bars of each symbol."""
+    rank = (
+        func.row_number()
+        .over(partition_by=PriceBar.asset_id, order_by=PriceBar.timestamp.desc())
+        .label("rank")
+    )
+    ranked = (
+        select(Asset.symbol, PriceBar.timestamp, PriceBar.open, PriceBar.high, PriceBar.low,
+               PriceBar.close, PriceBar.volume, rank)
+        .join(PriceBar, PriceBar.asset_id == Asset.id)
+        .where(Asset.symbol.in_(symbols))
+        .subquery()
+    )
+    result = await session.execute(
+        select(ranked).where(ranked.c.rank <= WINDOW).order_by(ranked.c.symbol, ranked.c.timestamp)
+    )
+    for symbol, timestamp, open, high, low, close, volume, _ in result.all():
+        state.seed_bar(symbol, to_day(timestamp), open, high, low, close, volume)
+
+
+class TickIngestor:
+    """
+    Absorb tick batches into RollingMetrics and write the touched symbols to
+    the database in periodic batches instead of committing per tick.
+
+    Each flush merges the ticks seen since the previous one into the stored
+    bars and recomputes the written metrics from the stored history, so bars
+    written meanwhile by /ingest, /import or another worker's ingestor are
+    kept, and the flushed symbols are re-synced to them.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, max_dirty: int = MAX_DIRTY) -> None:
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.state = RollingMetrics()
+        self.dirty: set = set()
+        # Final bars of days that rolled over while their symbol awaited a flush.
+        self.closed_bars: List[Tuple[str, Dict[str, object]]] = []
+        self.accepted_total = 0
+        self.stale_total = 0
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._seed_lock = asyncio.Lock()
+
+    async def seed(self, session: AsyncSession, symbols: Iterable[str]) -> None:
+        """
+        Load the last WINDOW stored bars of symbols not yet in memory.
+
+        Seeding is serialized, so concurrent batches for a new symbol load its
+        history once, before any of their ticks are applied.
+        """
+        symbols = set(symbols)
+        if symbols.issubset(self.state.index):
+            return
+        async with self._seed_lock:
+            await self._seed(session, [symbol for symbol in symbols if symbol not in self.state.index])
+
+    async def _seed(self, session: AsyncSession, symbols: List[str]) -> None:
+        if not symbols:
+            return
+
+        await load_recent_bars(session, self.state, symbols)
+        # Symbols without stored bars get an empty row so they are not looked up again.
+        for symbol in symbols:
+            self.state.slot(symbol)
+        logger.info(f"Seeded rolling state for {len(symbols)} symbols.")
+
+    async def ingest(self, session: AsyncSession, ticks: List[Tick]) -> Dict[str, int]:
+        """
+        Apply a batch of ticks to the in-memory state.
+
+        Args:
+            session: Session used to seed symbols seen for the first time.
+            ticks: (symbol, price, timestamp, volume) tuples.
+
+        Returns:
+            Counts of accepted and stale (out-of-order day) ticks.
+        """
+        await self.seed(session, (tick[0] for tick in ticks))
+
+        accepted = 0
+        state = self.state
+        for symbol, price, timestamp, volume in ticks:
+            day = to_day(timestamp)
+            if symbol in self.dirty and day > state.day[state.index[symbol]]:
+                self.closed_bars.append((symbol, state.take_bar(symbol)))
+            if state.update(symbol, price, day, volume):
+                self.dirty.add(symbol)
+                accepted += 1
+
+        self.accepted_total += accepted
+        self.stale_total += len(ticks) - accepted
+        if len(self.dirty) >= self.max_dirty:
+            await self.flush()
+        return {"accepted": accepted, "stale": len(ticks) - accepted}
+
+    async def flush(self) -> int:
+        """
+        Write current-day bars and metrics of all dirty symbols in one transaction.
+
+        The bars are merged into the stored ones, the last WINDOW stored bars
+        are read back to compute the metrics, and symbols without ticks
+        applied during the write are re-synced to that stored history.
+
+        Returns:
+            Number of symbols written.
+        """
+        async with self._flush_lock:
+            if not self.dirty:
+                return 0
+
+            symbols, self.dirty = sorted(self.dirty), set()
+            closed, self.closed_bars = self.closed_bars, []
+            # Snapshot before awaiting so ticks applied meanwhile go to the next flush.
+            bars = closed + [(symbol, self.state.take_bar(symbol)) for symbol in symbols]
+            stored = RollingMetrics(len(symbols))
+
+            try:
+                async with SessionLocal() as session:
+                    ids = await bulk_upsert_assets(session, symbols, {})
+                    await bulk_merge_price_bars(session, [
+                        {"asset_id": ids[symbol], **bar} for symbol, bar in bars
+                    ])
+                    await load_recent_bars(session, stored, symbols)
+                    metrics = {symbol: stored.metrics(symbol) for symbol in symbols}
+                    await bulk_replace_metrics(session, [
+                        {"asset_id": ids[symbol], "timestamp": datetime.utcnow(), **metrics[symbol]}
+                        for symbol in symbols
+                    ])
+                    await session.commit()
+            except BaseException:
+                # Also on cancellation, so a flush interrupted by stop() is retried.
+                self.dirty.update(symbols)
+                index, day = self.state.index, self.state.day
+                rolled_over = []
+                for symbol, bar in bars[len(closed):]:
+                    if symbol not in index:
+                        continue
+                    if to_day(bar["timestamp"]) < day[index[symbol]]:
+                        # A day that rolled over during the write exists only in the snapshot.
+                        rolled_over.append((symbol, bar))
+                    elif bar["volume"] is not None:
+                        self.state.pending_volumes[index[symbol]] += bar["volume"]
+                self.closed_bars[:0] = closed + rolled_over
+                raise
+
+            for symbol in symbols:
+                if symbol in self.state.index and symbol not in self.dirty:
+                    self.state.copy_row(symbol, stored)
+            symbol_index.add_new(symbols)
+            for symbol in symbols:
+                broadcaster.publish(symbol, metrics[symbol])
+            logger.info(f"Flushed tick metrics for {len(symbols)} symbols.")
+            return len(symbols)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing tick metrics: {e}")
+
+    def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and write what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def reset(self) -> None:
+        """Drop all in-memory state, e.g. after the database was cleared."""
+        self.state = RollingMetrics()
+        self.dirty = set()
+        self.closed_bars = []
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "symbols": len(self.state.symbols),
+            "dirty": len(self.dirty),
+            "accepted_total": self.accepted_total,
+            "stale_total": self.stale_total,
+        }
+
+
+tick_ingestor = TickIngestor()
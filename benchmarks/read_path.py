@@ -0,0 +1,81 @@
+"""
+Compare the ORM and Core read paths used by the asset endpoints.
+
+Usage: python -m benchmarks.read_path [rows]
+
+Builds an in-memory SQLite database with one metric per asset, then times
+the previous ORM query (`joinedload` + entity formatting) against
+`app.core.queries.select_assets_with_metrics` and reports the cost per row.
+"""
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
+
+from app.core.database import Base
+from app.core.models import Asset, Metric
+from app.core.queries import select_assets_with_metrics
+
+REPEATS = 5
+
+
+async def orm_assets_with_metrics(db: AsyncSession) -> List[Dict[str, Any]]:
+    """The ORM path the asset endpoint used before the Core query layer."""
+    result = await db.execute(select(Asset).options(joinedload(Asset.metrics)))
+    return [
+        {
+            "symbol": asset.symbol,
+            "name": asset.name,
+            "metrics": [
+                {
+                    "latest_price": metric.latest_price,
+                    "change_percent_24h": metric.change_percent_24h,
+                    "average_price_7d": metric.average_price_7d,
+                }
+                for metric in asset.metrics
+            ] or None,
+        }
+        for asset in result.unique().scalars().all()
+    ]
+
+
+async def best_time(session_factory: Callable[[], AsyncSession], query: Callable[[AsyncSession], Awaitable[List]]) -> float:
+    """Best wall time of REPEATS runs, each in a fresh session so the identity map starts empty."""
+    timings = []
+    for _ in range(REPEATS):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await query(db)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main(rows: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Asset), [{"id": i, "symbol": f"SYM{i}", "name": f"Asset {i}"} for i in range(1, rows + 1)])
+        await conn.execute(insert(Metric), [
+            {"asset_id": i, "latest_price": 100.0 + i, "change_percent_24h": 0.5, "average_price_7d": 99.0 + i}
+            for i in range(1, rows + 1)
+        ])
+
+    def session_factory() -> AsyncSession:
+        return AsyncSession(engine)
+
+    orm = await best_time(session_factory, orm_assets_with_metrics)
+    core = await best_time(session_factory, select_assets_with_metrics)
+    print(f"rows: {rows}")
+    print(f"orm : {orm * 1000:8.1f} ms  {orm / rows * 1e6:6.2f} us/row")
+    print(f"core: {core * 1000:8.1f} ms  {core / rows * 1e6:6.2f} us/row")
+    print(f"speedup: {orm / core:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
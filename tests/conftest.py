@@ -0,0 +1,18 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, add_missing_columns, add_missing_indexes
+from app.core import models  # noqa: F401  (registers the tables on Base)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Session factory bound to a fresh SQLite database file."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(add_missing_indexes)
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
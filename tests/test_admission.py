@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from app.core.admission import AdmissionController, AdmissionRejected
+
+
+def make_controller(**overrides):
+    options = dict(max_concurrency=1, max_queue=1, default_budget=10.0, expected_service_time=2.0)
+    options.update(overrides)
+    return AdmissionController("test", **options)
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_queue_are_rejected_with_429():
+    controller = make_controller()
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.slot():
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        async with controller.slot():
+            pass
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after >= 1
+    assert controller.stats()["shed_total"] == 1
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert controller.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_request_over_budget_is_rejected_with_503():
+    controller = make_controller(max_queue=5)
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.slot():
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        async with controller.slot(budget=0.5):
+            pass
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.retry_after == 2
+
+    release.set()
+    await running
@@ -0,0 +1,103 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from app.services.analytics import ReturnWindow, _cache, compute_matrices, encode_array, get_cross_asset_matrices
+from app.services.ingestion import bulk_upsert_assets, bulk_upsert_price_bars
+
+
+def test_compute_matrices_matches_numpy():
+    returns = np.random.default_rng(1).normal(0, 0.01, (60, 4))
+    matrices = compute_matrices(np.cov(returns, rowvar=False), benchmark_index=0)
+
+    np.testing.assert_allclose(matrices["correlation"], np.corrcoef(returns, rowvar=False))
+    assert matrices["beta"][0] == 1.0
+
+
+def test_return_window_push_matches_full_recompute():
+    returns = np.random.default_rng(2).normal(0, 0.01, (80, 3))
+    window = ReturnWindow(returns[:30], window=30)
+
+    for row in returns[30:]:
+        window.push(row)
+
+    assert window.size == 30
+    np.testing.assert_allclose(window.covariance(), np.cov(returns[-30:], rowvar=False))
+
+
+def test_encode_array_rounds_and_maps_non_finite_values_to_null():
+    assert json.loads(encode_array(np.array([[1 / 3, -2e-7], [np.nan, -np.inf]]))) == [
+        [0.333333, -2e-07], [None, None]
+    ]
+    assert json.loads(encode_array(np.array([1.0, np.inf]))) == [1.0, None]
+
+
+async def store_history(session, closes):
+    """Create one asset per column of `closes` and store its daily bars."""
+    ids = await bulk_upsert_assets(session, [f"S{i}" for i in range(closes.shape[1])], {})
+    start = datetime(2024, 1, 1)
+    await bulk_upsert_price_bars(session, [
+        {"asset_id": ids[f"S{i}"], "timestamp": start + timedelta(days=day), "close": float(close)}
+        for day, row in enumerate(closes)
+        for i, close in enumerate(row)
+    ])
+    await session.commit()
+    return ids
+
+
+async def matrices(session, symbols, window=20):
+    return json.loads(await get_cross_asset_matrices(session, symbols, "S0", window))
+
+
+async def fresh_matrices(session, symbols, window=20):
+    _cache.clear()
+    return await matrices(session, symbols, window)
+
+
+@pytest.mark.asyncio
+async def test_cached_matrices_follow_appended_and_amended_bars(session_factory):
+    closes = 100 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.01, (40, 3)), axis=0)
+    symbols = ["S0", "S1", "S2"]
+    _cache.clear()
+
+    async with session_factory() as session:
+        ids = await store_history(session, closes[:30])
+        first = await matrices(session, symbols)
+
+        # Appending bars is applied incrementally and matches a full rebuild.
+        await store_history(session, closes)
+        appended = await matrices(session, symbols)
+        np.testing.assert_allclose(
+            appended["covariance"], (await fresh_matrices(session, symbols))["covariance"], rtol=1e-5
+        )
+        assert appended["as_of"] != first["as_of"]
+
+        # Amending the latest bar in place must not serve the stale result.
+        await bulk_upsert_price_bars(session, [
+            {"asset_id": ids["S1"], "timestamp": datetime(2024, 1, 1) + timedelta(days=39), "close": 1.0}
+        ])
+        await session.commit()
+        amended = await matrices(session, symbols)
+        np.testing.assert_allclose(
+            amended["covariance"], (await fresh_matrices(session, symbols))["covariance"], rtol=1e-5
+        )
+        assert amended["covariance"] != appended["covariance"]
+
+
+@pytest.mark.asyncio
+async def test_reordered_symbols_share_the_cached_entry(session_factory):
+    closes = 100 * np.cumprod(1 + np.random.default_rng(4).normal(0, 0.01, (30, 3)), axis=0)
+    _cache.clear()
+
+    async with session_factory() as session:
+        await store_history(session, closes)
+        ordered = await matrices(session, ["S1", "S2"])
+        reordered = await matrices(session, ["S2", "S0", "S1"])
+
+    assert len(_cache) == 1
+    assert reordered["symbols"] == ["S2", "S0", "S1"]
+    assert ordered["symbols"] == ["S1", "S2", "S0"]
+    # Rows and columns follow the requested order.
+    assert reordered["covariance"][0][2] == ordered["covariance"][1][0]
+    assert reordered["beta"] == ordered["beta"]
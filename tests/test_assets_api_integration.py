@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from fastapi import HTTPException
-from app.api.assets import list_assets, Asset, Metric
+from app.api.assets import list_assets
 
 
 @pytest.mark.asyncio
@@ -45,30 +45,28 @@ async def test_list_assets_returns_mocked_data():
 
     print("Mock data prepared:", mock_data)
 
-    # Mock Asset and Metric objects
-    mock_assets = []
-    for asset_dict in mock_data:
-        asset = MagicMock(spec=Asset)
-        asset.symbol = asset_dict["symbol"]
-        asset.name = asset_dict["name"]
-        asset.metrics = [
-            MagicMock(
-                spec=Metric,
-                latest_price=metric["latest_price"],
-                change_percent_24h=metric["change_percent_24h"],
-                average_price_7d=metric["average_price_7d"],
-            )
-            for metric in asset_dict["metrics"]
-        ]
-        mock_assets.append(asset)
-
-    print("Mock assets created:", mock_assets)
+    # Mock the joined (symbol, name, metric columns) rows returned by the query
+    mock_rows = [
+        (
+            asset_dict["symbol"],
+            asset_dict["name"],
+            metric["latest_price"],
+            metric["change_percent_24h"],
+            metric["average_price_7d"],
+        )
+        for asset_dict in mock_data
+        for metric in asset_dict["metrics"]
+    ]
+    mock_rows.append(("SOL-USD", "SOL-USD", None, None, None))
+    mock_data.append({"symbol": "SOL-USD", "name": "SOL-USD", "metrics": None})
+
+    print("Mock rows created:", mock_rows)
 
     # Mock SQLAlchemy query result behavior
     mock_query_result = MagicMock()
-    mock_query_result.unique.return_value.scalars.return_value.all.return_value = mock_assets
+    mock_query_result.all.return_value = mock_rows
 
-    print("Mock query result set up with chained calls")
+    print("Mock query result set up")
 
     # Mock database execute function
     mock_db = AsyncMock()
@@ -0,0 +1,39 @@
+import pytest
+from app.services.broadcast import MetricBroadcaster, Subscriber
+
+
+@pytest.mark.asyncio
+async def test_publish_pushes_only_changed_fields():
+    broadcaster = MetricBroadcaster()
+    subscriber = Subscriber()
+    broadcaster.subscribe(subscriber, ["BTC-USD"])
+
+    broadcaster.publish("BTC-USD", {"latest_price": 100.0, "change_percent_24h": 1.0})
+    assert await subscriber.next_batch() == {"BTC-USD": {"latest_price": 100.0, "change_percent_24h": 1.0}}
+
+    delta = broadcaster.publish("BTC-USD", {"latest_price": 101.0, "change_percent_24h": 1.0})
+    assert delta == {"latest_price": 101.0}
+    assert await subscriber.next_batch() == {"BTC-USD": {"latest_price": 101.0}}
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_updates_are_coalesced():
+    broadcaster = MetricBroadcaster()
+    subscriber = Subscriber()
+    broadcaster.subscribe(subscriber, ["ETH-USD"])
+
+    for price in (1.0, 2.0, 3.0):
+        broadcaster.publish("ETH-USD", {"latest_price": price, "average_price_7d": 2.0})
+
+    assert await subscriber.next_batch() == {"ETH-USD": {"latest_price": 3.0, "average_price_7d": 2.0}}
+    assert subscriber.coalesced == 2
+
+
+def test_unsubscribed_symbols_are_not_pushed():
+    broadcaster = MetricBroadcaster()
+    subscriber = Subscriber()
+    broadcaster.subscribe(subscriber, ["TSLA"])
+    broadcaster.unsubscribe(subscriber)
+
+    broadcaster.publish("TSLA", {"latest_price": 250.0})
+    assert subscriber.pending == {}
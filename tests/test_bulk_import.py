@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+import pytest
+from app.api import bulk_import as bulk_import_api
+from app.api.bulk_import import spool_body
+from app.services.bulk_import import import_file, validate_frame
+
+
+def test_validate_frame_drops_invalid_and_duplicate_bars():
+    frame = pd.DataFrame({
+        "Symbol": ["BTC-USD", "BTC-USD", "ETH-USD", "ETH-USD", None],
+        "Timestamp": ["2024-01-01", "2024-01-01", "2024-01-01", "not a date", "2024-01-01"],
+        "Close": [42000.0, 42100.0, -1.0, 2300.0, 10.0],
+        "High": [42500.0, 42600.0, 2400.0, 2400.0, 11.0],
+        "Low": [41000.0, 41000.0, 2200.0, 2200.0, 9.0],
+    })
+
+    valid = validate_frame(frame, "bars")
+
+    assert valid["symbol"].tolist() == ["BTC-USD"]
+    assert valid["close"].tolist() == [42100.0]
+    assert valid["volume"].isna().all()
+
+
+def test_validate_frame_converts_aware_timestamps_to_utc():
+    frame = pd.DataFrame({"symbol": ["TSLA"], "timestamp": ["2024-01-01T09:30:00-05:00"], "close": [250.0]})
+    valid = validate_frame(frame, "bars")
+    assert valid["timestamp"].iloc[0] == pd.Timestamp("2024-01-01 14:30:00")
+
+
+def test_validate_frame_requires_metric_columns():
+    with pytest.raises(ValueError):
+        validate_frame(pd.DataFrame({"symbol": ["TSLA"], "latest_price": [250.0]}), "metrics")
+
+
+class StreamingRequest:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_spool_body_writes_the_whole_stream(monkeypatch):
+    monkeypatch.setattr(bulk_import_api, "SPOOL_WRITE_SIZE", 4)
+    path = await spool_body(StreamingRequest([b"symbol,", b"close\n", b"TSLA,250\n"]), ".csv")
+    try:
+        with open(path, "rb") as handle:
+            assert handle.read() == b"symbol,close\nTSLA,250\n"
+    finally:
+        os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_import_file_writes_every_chunk(session_factory, tmp_path):
+    path = tmp_path / "bars.csv"
+    pd.DataFrame({
+        "symbol": ["BTC-USD", "ETH-USD", "BTC-USD", "ETH-USD", "SOL-USD"],
+        "timestamp": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02", "2024-01-02"],
+        "close": [42000.0, 2300.0, 42100.0, -1.0, 100.0],
+    }).to_csv(path, index=False)
+
+    async with session_factory() as session:
+        totals = await import_file(session, str(path), "bars", chunk_size=2)
+
+    assert totals == {"rows_skipped": 0, "rows_read": 5, "rows_written": 4, "rows_rejected": 1}
+    assert not os.path.exists(f"{path}.import-progress.json")
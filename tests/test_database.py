@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
-from app.core.database import init_db
+from sqlalchemy import create_engine, inspect, text
+from app.core.database import ADDED_INDEXES, add_missing_indexes, init_db
 
 @pytest.mark.asyncio
 @patch("app.core.database.engine")
@@ -29,3 +30,18 @@ async def test_init_db_failure(mock_engine):
 
         # Assert error logger call
         mock_logger.error.assert_called_with("Error initializing the database: DB error")
+
+
+def test_add_missing_indexes_migrates_an_existing_metrics_table():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE metrics (id INTEGER PRIMARY KEY, asset_id INTEGER, latest_price FLOAT,"
+            " change_percent_24h FLOAT, average_price_7d FLOAT, timestamp DATETIME)"
+        ))
+        add_missing_indexes(connection)
+        # Running it again on a migrated database is a no-op.
+        add_missing_indexes(connection)
+        indexes = {index["name"] for index in inspect(connection).get_indexes("metrics")}
+
+    assert indexes == set(ADDED_INDEXES)
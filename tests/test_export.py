@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime
+from app.services.export import build_export_query, encode_csv, export_dataset
+from app.services.ingestion import upsert_asset, upsert_metric
+
+
+async def chunks_of(*chunks):
+    for rows in chunks:
+        yield rows
+
+
+@pytest.mark.asyncio
+async def test_encode_csv_writes_header_once_and_iso_timestamps():
+    rows = [("BTC-USD", datetime(2024, 1, 1), 42000.0)], [("ETH-USD", datetime(2024, 1, 2), 2300.0)]
+    output = b"".join([data async for data in encode_csv(["symbol", "timestamp", "close"], chunks_of(*rows))])
+
+    assert output.decode().splitlines() == [
+        "symbol,timestamp,close",
+        "BTC-USD,2024-01-01T00:00:00,42000.0",
+        "ETH-USD,2024-01-02T00:00:00,2300.0",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_encode_csv_writes_header_for_empty_export():
+    output = b"".join([data async for data in encode_csv(["symbol"], chunks_of())])
+    assert output == b"symbol\r\n"
+
+
+def test_export_rejects_unknown_dataset_and_format():
+    with pytest.raises(ValueError):
+        build_export_query("trades")
+    with pytest.raises(ValueError):
+        export_dataset("assets", "xml")
+
+
+@pytest.mark.asyncio
+async def test_since_filter_includes_refreshed_metrics(session_factory):
+    async with session_factory() as session:
+        asset = await upsert_asset(session, "BTC-USD")
+        await upsert_metric(session, asset.id, {"latest_price": 1.0, "change_percent_24h": 0.0, "average_price_7d": 1.0})
+        since = datetime.utcnow()
+
+        await upsert_metric(session, asset.id, {"latest_price": 2.0, "change_percent_24h": 100.0, "average_price_7d": 1.5})
+        metrics = (await session.execute(build_export_query("metrics", since=since))).all()
+        assets = (await session.execute(build_export_query("assets", since=since))).all()
+
+    assert [row[:2] for row in metrics] == [("BTC-USD", 2.0)]
+    assert [row[0] for row in assets] == ["BTC-USD"]
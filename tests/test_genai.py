@@ -1,5 +1,6 @@
 import pytest
-from app.services.genai import generate_summary
+from app.services import genai
+from app.services.genai import build_chunks, chunk_texts, generate_summary
 
 @pytest.mark.parametrize(
     "data, expected_output",
@@ -11,3 +12,65 @@ from app.services.genai import generate_summary
 def test_generate_summary(data, expected_output):
     result = generate_summary(data)
     assert expected_output in result
+
+
+def test_chunk_texts_respects_token_budget():
+    texts = ["a b c", "d e", "f g h i", "j"]
+    chunks = chunk_texts(texts, max_tokens=5, counter=lambda text: len(text.split()))
+    assert chunks == ["a b c d e", "f g h i j"]
+
+
+def test_chunk_texts_keeps_oversized_text():
+    chunks = chunk_texts(["a b c d e f", "g"], max_tokens=3, counter=lambda text: len(text.split()))
+    assert chunks == ["a b c d e f", "g"]
+
+
+class FakeSummarizer:
+    """Stands in for the pipeline: counts words as tokens and records prompts."""
+
+    def __init__(self):
+        self.tokenizer = type("Tokenizer", (), {"encode": staticmethod(str.split)})()
+        self.calls = []
+
+    def __call__(self, prompts, **kwargs):
+        self.calls.append(prompts)
+        return [[{"generated_text": f"partial summary {i}"}] for i, _ in enumerate(prompts)]
+
+
+def make_assets(count):
+    return [
+        {"symbol": f"S{i}", "change_percent_24h": round((i % 200) / 10 - 10, 1), "average_price_7d": 100.0}
+        for i in range(count)
+    ]
+
+
+def test_generate_summary_model_calls_do_not_grow_with_universe(monkeypatch):
+    fake = FakeSummarizer()
+    monkeypatch.setattr(genai, "summarizer", fake)
+
+    generate_summary(make_assets(5000))
+
+    assert len(fake.calls[0]) <= genai.MAX_MAP_CHUNKS
+    assert sum(len(prompts) for prompts in fake.calls) <= 2 * genai.MAX_MAP_CHUNKS
+    map_prompts = " ".join(fake.calls[0])
+    assert "S199 had a 9.9% change" in map_prompts
+    assert "other assets had an average" in map_prompts
+
+
+def test_build_chunks_keeps_top_movers_within_max_chunks(monkeypatch):
+    monkeypatch.setattr(genai, "summarizer", FakeSummarizer())
+
+    chunks = build_chunks(make_assets(3000), max_chunks=2)
+
+    assert len(chunks) <= 2
+    assert "S0 had a -10.0% change" in chunks[0]
+    assert chunks[-1].endswith("down.") and "other assets had an average" in chunks[-1]
+
+    assert len(build_chunks(make_assets(3000), max_chunks=1)) == 1
+
+
+def test_build_chunks_keeps_small_universes_whole(monkeypatch):
+    monkeypatch.setattr(genai, "summarizer", FakeSummarizer())
+    assets = make_assets(4)
+
+    assert build_chunks(assets) == [" ".join(genai.format_asset_line(asset) for asset in assets)]
@@ -0,0 +1,39 @@
+import asyncio
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from app.services import model_server
+from app.services.model_server import ModelServer, RemoteSummarizer
+
+
+def fake_pipeline(inputs, **kwargs):
+    return [[{"generated_text": f"{prompt} ({kwargs['max_new_tokens']})"}] for prompt in inputs]
+
+
+@pytest.mark.asyncio
+async def test_remote_summarizer_round_trip(tmp_path):
+    socket_path = str(tmp_path / "model.sock")
+    with patch.object(model_server, "load_pipeline", return_value=fake_pipeline), \
+            patch("tokenizers.Tokenizer.from_pretrained"):
+        server = asyncio.create_task(ModelServer(socket_path).serve())
+        while not (tmp_path / "model.sock").exists():
+            await asyncio.sleep(0.01)
+
+        client = RemoteSummarizer(socket_path, timeout=5)
+        results = await asyncio.to_thread(client, ["BTC", "ETH"], max_new_tokens=10)
+        server.cancel()
+
+    assert results == [[{"generated_text": "BTC (10)"}], [{"generated_text": "ETH (10)"}]]
+
+
+def test_remote_summarizer_does_not_import_torch():
+    script = (
+        "import sys, tokenizers\n"
+        "from unittest.mock import patch\n"
+        "with patch.object(tokenizers.Tokenizer, 'from_pretrained'):\n"
+        "    from app.services.model_server import RemoteSummarizer\n"
+        "    RemoteSummarizer('unused.sock')\n"
+        "assert 'torch' not in sys.modules and 'transformers' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,72 @@
+import pytest
+from fastapi import HTTPException
+from app.api.screener import screen_assets
+from app.services.ingestion import bulk_replace_metrics, bulk_upsert_assets
+
+# symbol: (latest_price, change_percent_24h, average_price_7d)
+METRICS = {
+    "BTC-USD": (64000.0, 2.5, 63000.0),
+    "ETH-USD": (1780.37, 1.31, 1641.34),
+    "TSLA": (237.97, 4.6, 243.88),
+    "DOGE-USD": (0.08, -7.2, 0.09),
+    "AAPL": (189.5, -0.4, 190.1),
+}
+
+
+async def store_metrics(session):
+    ids = await bulk_upsert_assets(session, list(METRICS), {})
+    await bulk_replace_metrics(session, [
+        {"asset_id": ids[symbol], "latest_price": price, "change_percent_24h": change, "average_price_7d": average}
+        for symbol, (price, change, average) in METRICS.items()
+    ])
+    await session.commit()
+
+
+async def screen(session, sort_by="change_percent_24h", order="desc", limit=10,
+                 min_change=None, max_change=None, min_price=None, max_price=None):
+    rows = await screen_assets(
+        sort_by=sort_by, order=order, limit=limit, min_change=min_change, max_change=max_change,
+        min_price=min_price, max_price=max_price, db=session,
+    )
+    return [row["symbol"] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_screen_assets_returns_top_and_bottom_movers(session_factory):
+    async with session_factory() as session:
+        await store_metrics(session)
+
+        assert await screen(session, limit=3) == ["TSLA", "BTC-USD", "ETH-USD"]
+        assert await screen(session, order="asc", limit=2) == ["DOGE-USD", "AAPL"]
+        assert await screen(session, sort_by="latest_price", limit=1) == ["BTC-USD"]
+
+        rows = await screen_assets(
+            sort_by="change_percent_24h", order="desc", limit=1,
+            min_change=None, max_change=None, min_price=None, max_price=None, db=session,
+        )
+    assert rows == [{
+        "symbol": "TSLA", "name": "TSLA", "latest_price": 237.97,
+        "change_percent_24h": 4.6, "average_price_7d": 243.88,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_screen_assets_applies_change_and_price_thresholds(session_factory):
+    async with session_factory() as session:
+        await store_metrics(session)
+
+        assert await screen(session, min_change=0, max_change=3) == ["BTC-USD", "ETH-USD"]
+        assert await screen(session, order="asc", max_change=0) == ["DOGE-USD", "AAPL"]
+        assert await screen(session, min_price=1, max_price=2000) == ["TSLA", "ETH-USD", "AAPL"]
+        assert await screen(session, min_change=1, min_price=1000, limit=1) == ["BTC-USD"]
+
+
+@pytest.mark.asyncio
+async def test_screen_assets_rejects_unknown_sort_field():
+    with pytest.raises(HTTPException) as exc_info:
+        await screen_assets(
+            sort_by="volume", order="desc", limit=10,
+            min_change=None, max_change=None, min_price=None, max_price=None, db=None,
+        )
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import delete
+
+from app.core.models import Asset
+from app.services.ingestion import bulk_upsert_assets
+from app.services.search import SymbolIndex, edit_distance, load_symbol_index, refresh_symbol_index, symbol_index
+
+
+def make_index():
+    index = SymbolIndex()
+    index.add_many([
+        ("BTC-USD", "Bitcoin USD"),
+        ("BTC", "Bitcoin"),
+        ("BCH-USD", "Bitcoin Cash USD"),
+        ("ETH-USD", "Ethereum USD"),
+        ("TSLA", "Tesla Inc"),
+    ])
+    return index
+
+
+def test_results_are_ranked_exact_then_prefix_then_name():
+    results = make_index().search("btc")
+
+    assert [(row["symbol"], row["match"]) for row in results] == [
+        ("BTC", "exact"),
+        ("BTC-USD", "symbol"),
+    ]
+    assert [row["symbol"] for row in make_index().search("bitc", limit=2)] == ["BCH-USD", "BTC"]
+
+
+def test_typos_fall_back_to_fuzzy_matches():
+    index = make_index()
+
+    assert index.search("tesal") == [{"symbol": "TSLA", "name": "Tesla Inc", "match": "fuzzy"}]
+    assert {row["symbol"] for row in index.search("etherium")} == {"ETH-USD"}
+    # Short queries only match by prefix.
+    assert index.search("zz") == []
+
+
+def test_index_is_updated_incrementally():
+    index = make_index()
+    index.add("SOL-USD")
+    index.add("TSLA", "Tesla Motors")
+
+    assert index.search("sol")[0]["symbol"] == "SOL-USD"
+    assert index.search("motors")[0]["symbol"] == "TSLA"
+    assert index.search("inc") == []
+
+    index.remove("TSLA")
+    assert index.search("tesla") == []
+    assert len(index) == 5
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("tesla", "tesal", limit=2) == 1
+    assert edit_distance("bitcoin", "bitcion", limit=2) == 1
+    assert edit_distance("abc", "xyz", limit=1) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_assets_written_by_other_workers(session_factory):
+    async with session_factory() as session:
+        await bulk_upsert_assets(session, ["BTC-USD"], {})
+        await session.commit()
+        await load_symbol_index(session)
+
+        # Another worker adds an asset, then clears the database.
+        await bulk_upsert_assets(session, ["ETH-USD"], {})
+        await session.commit()
+        assert symbol_index.search("eth") == []
+        await refresh_symbol_index(session)
+        assert symbol_index.search("eth")[0]["symbol"] == "ETH-USD"
+
+        await session.execute(delete(Asset))
+        await session.commit()
+        assert await refresh_symbol_index(session) == 0
+        assert symbol_index.search("btc") == []
@@ -0,0 +1,235 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.future import select
+
+from app.core.models import Asset, PriceBar
+from app.core.queries import select_metrics_by_symbols
+from app.services import ticks
+from app.services.ingestion import bulk_merge_price_bars, bulk_replace_metrics, bulk_upsert_assets, bulk_upsert_price_bars
+from app.services.search import symbol_index
+from app.services.ticks import WINDOW, RollingMetrics, TickIngestor
+
+
+def expected_metrics(closes):
+    window = closes[-WINDOW:]
+    latest = window[-1]
+    change = round((latest - window[-2]) / window[-2] * 100, 2) if len(window) > 1 else 0.0
+    return {
+        "latest_price": latest,
+        "change_percent_24h": change,
+        "average_price_7d": round(sum(window) / len(window), 2),
+    }
+
+
+def test_incremental_metrics_match_recomputation():
+    random.seed(7)
+    state = RollingMetrics(capacity=2)
+    daily_closes = {"AAA": [], "BBB": [], "CCC": []}
+
+    for day in range(1, 20):
+        for symbol, closes in daily_closes.items():
+            for _ in range(random.randint(1, 5)):
+                price = random.uniform(10, 100)
+                assert state.update(symbol, price, day)
+            closes.append(price)
+            assert state.metrics(symbol) == pytest.approx(expected_metrics(closes))
+
+    # The arrays grew past their initial capacity without losing rows.
+    assert len(state.symbols) == 3
+
+
+def test_ticks_for_an_older_day_are_ignored():
+    state = RollingMetrics()
+    state.update("AAA", 10.0, day=2)
+    state.update("AAA", 12.0, day=3)
+
+    assert not state.update("AAA", 99.0, day=2)
+    assert state.metrics("AAA") == {"latest_price": 12.0, "change_percent_24h": 20.0, "average_price_7d": 11.0}
+
+
+def test_bar_tracks_the_current_day():
+    state = RollingMetrics()
+    state.seed_bar("AAA", 5, open=9.0, high=11.0, low=8.0, close=10.0, volume=100.0)
+    state.update("AAA", 12.0, day=5, volume=5.0)
+    state.update("AAA", 7.0, day=5)
+
+    bar = state.bar("AAA")
+    assert (bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]) == (9.0, 12.0, 7.0, 7.0, 105.0)
+
+    state.update("AAA", 8.0, day=6)
+    bar = state.bar("AAA")
+    assert bar["timestamp"].toordinal() == 6
+    assert (bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]) == (8.0, 8.0, 8.0, 8.0, None)
+
+
+TODAY = datetime(2024, 1, 10)
+
+
+@pytest.fixture
+def ingestor(session_factory, monkeypatch):
+    monkeypatch.setattr(ticks, "SessionLocal", session_factory)
+    symbol_index.clear()
+    return TickIngestor()
+
+
+async def store_bars(session_factory, symbol, closes):
+    """Store daily bars for `symbol` ending the day before TODAY."""
+    async with session_factory() as session:
+        ids = await bulk_upsert_assets(session, [symbol], {})
+        await bulk_upsert_price_bars(session, [
+            {"asset_id": ids[symbol], "timestamp": TODAY - timedelta(days=len(closes) - day),
+             "open": 1.0, "high": 2.0, "low": 0.5, "close": close, "volume": 999.0}
+            for day, close in enumerate(closes)
+        ])
+        await session.commit()
+
+
+async def stored_bars(session_factory, symbol):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(PriceBar.timestamp, PriceBar.open, PriceBar.high, PriceBar.low, PriceBar.close, PriceBar.volume)
+            .join(Asset).where(Asset.symbol == symbol).order_by(PriceBar.timestamp)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_ingest_seeds_from_history_and_flushes(ingestor, session_factory):
+    await store_bars(session_factory, "AAA", [100.0, 110.0])
+
+    async with session_factory() as session:
+        counts = await ingestor.ingest(session, [("AAA", 121.0, TODAY, 5.0)])
+
+    assert counts == {"accepted": 1, "stale": 0}
+    assert ingestor.state.metrics("AAA") == {"latest_price": 121.0, "change_percent_24h": 10.0, "average_price_7d": 110.33}
+    assert await ingestor.flush() == 1
+    assert (await stored_bars(session_factory, "AAA"))[-1] == (TODAY, 121.0, 121.0, 121.0, 121.0, 5.0)
+    async with session_factory() as session:
+        assert (await select_metrics_by_symbols(session, ["AAA"]))["AAA"]["average_price_7d"] == 110.33
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_seed_a_new_symbol_once(ingestor, session_factory):
+    await store_bars(session_factory, "AAA", [1.0, 1.5])
+
+    async with session_factory() as first, session_factory() as second:
+        await asyncio.gather(
+            ingestor.ingest(first, [("AAA", 10.0, TODAY, 5.0), ("AAA", 12.0, TODAY, None)]),
+            ingestor.ingest(second, [("AAA", 11.0, TODAY, None)]),
+        )
+
+    bar = ingestor.state.bar("AAA")
+    assert (bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]) == (10.0, 12.0, 10.0, 11.0, 5.0)
+    assert ingestor.state.metrics("AAA")["average_price_7d"] == round((1.0 + 1.5 + 11.0) / 3, 2)
+
+
+@pytest.mark.asyncio
+async def test_rolled_over_days_are_flushed_as_closed_bars(ingestor, session_factory):
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("NEW", 10.0, TODAY, None), ("NEW", 20.0, TODAY + timedelta(days=1), None)])
+    await ingestor.flush()
+
+    assert [(bar[0], bar[4]) for bar in await stored_bars(session_factory, "NEW")] == [
+        (TODAY, 10.0), (TODAY + timedelta(days=1), 20.0)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_from_several_workers_merge_into_the_stored_bar(ingestor, session_factory):
+    await store_bars(session_factory, "AAA", [100.0])
+    other_worker = TickIngestor()
+
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("AAA", 105.0, TODAY, 5.0)])
+        await other_worker.ingest(session, [("AAA", 99.0, TODAY, 3.0), ("AAA", 101.0, TODAY, 1.0)])
+    await ingestor.flush()
+    await other_worker.flush()
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("AAA", 102.0, TODAY, 2.0)])
+    await ingestor.flush()
+
+    assert (await stored_bars(session_factory, "AAA"))[-1] == (TODAY, 105.0, 105.0, 99.0, 102.0, 11.0)
+    bar = ingestor.state.bar("AAA")
+    assert (bar["open"], bar["high"], bar["low"], bar["volume"]) == (105.0, 105.0, 99.0, 11.0)
+
+
+@pytest.mark.asyncio
+async def test_flush_computes_metrics_from_history_written_after_seeding(ingestor, session_factory):
+    await store_bars(session_factory, "AAA", [100.0])
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("AAA", 110.0, TODAY, None)])
+
+    # /ingest stores a fuller history meanwhile.
+    await store_bars(session_factory, "AAA", [80.0, 90.0, 100.0])
+    await ingestor.flush()
+
+    expected = expected_metrics([80.0, 90.0, 100.0, 110.0])
+    async with session_factory() as session:
+        stored = (await select_metrics_by_symbols(session, ["AAA"]))["AAA"]
+    assert {field: stored[field] for field in expected} == pytest.approx(expected)
+    assert ingestor.state.metrics("AAA") == pytest.approx(expected)
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_pending_writes(ingestor, session_factory, monkeypatch):
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("AAA", 10.0, TODAY, None), ("AAA", 20.0, TODAY + timedelta(days=1), None)])
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(ticks, "bulk_replace_metrics", fail)
+    with pytest.raises(RuntimeError):
+        await ingestor.flush()
+    assert ingestor.dirty == {"AAA"} and len(ingestor.closed_bars) == 1
+    assert "AAA" not in symbol_index.names
+
+    monkeypatch.setattr(ticks, "bulk_replace_metrics", bulk_replace_metrics)
+    assert await ingestor.flush() == 1
+    assert len(await stored_bars(session_factory, "AAA")) == 2
+    assert "AAA" in symbol_index.names
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_a_day_that_rolled_over_during_the_write(ingestor, session_factory, monkeypatch):
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("AAA", 10.0, TODAY, None)])
+
+    async def fail(*args, **kwargs):
+        async with session_factory() as session:
+            await ingestor.ingest(session, [("AAA", 20.0, TODAY + timedelta(days=1), None)])
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(ticks, "bulk_replace_metrics", fail)
+    with pytest.raises(RuntimeError):
+        await ingestor.flush()
+
+    monkeypatch.setattr(ticks, "bulk_replace_metrics", bulk_replace_metrics)
+    await ingestor.flush()
+    assert [(bar[0], bar[4]) for bar in await stored_bars(session_factory, "AAA")] == [
+        (TODAY, 10.0), (TODAY + timedelta(days=1), 20.0)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stop_during_a_flush_still_writes_pending_ticks(ingestor, session_factory, monkeypatch):
+    writing = asyncio.Event()
+
+    async def slow_upsert(session, rows):
+        writing.set()
+        await asyncio.sleep(10)
+
+    async with session_factory() as session:
+        await ingestor.ingest(session, [("AAA", 10.0, TODAY, None)])
+
+    monkeypatch.setattr(ticks, "bulk_merge_price_bars", slow_upsert)
+    ingestor.flush_interval = 0
+    ingestor.start()
+    await writing.wait()
+
+    monkeypatch.setattr(ticks, "bulk_merge_price_bars", bulk_merge_price_bars)
+    await ingestor.stop()
+    assert await stored_bars(session_factory, "AAA") == [(TODAY, 10.0, 10.0, 10.0, 10.0, None)]